@@ -0,0 +1,76 @@
+"""Add lookup indexes
+
+Revision ID: 3b9c2f4e8a71
+Revises: 6edfc81e2def
+Create Date: 2026-10-18 11:04:52.318406
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "3b9c2f4e8a71"
+down_revision: Union[str, None] = "6edfc81e2def"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_document_translations_locale_slug",
+        "document_translations",
+        ["locale", "slug"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_blog_post_translations_locale_slug",
+        "blog_post_translations",
+        ["locale", "slug"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_email_threads_source"), "email_threads", ["source"], unique=False
+    )
+    op.create_index(op.f("ix_emails_thread_id"), "emails", ["thread_id"], unique=False)
+    op.create_index(op.f("ix_emails_parent_id"), "emails", ["parent_id"], unique=False)
+    op.create_index(
+        op.f("ix_forum_threads_source"), "forum_threads", ["source"], unique=False
+    )
+    op.create_index(
+        op.f("ix_forum_posts_thread_id"), "forum_posts", ["thread_id"], unique=False
+    )
+    op.create_index(
+        op.f("ix_quote_quote_categories_quote_id"),
+        "quote_quote_categories",
+        ["quote_id"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_quote_quote_categories_quote_category_id"),
+        "quote_quote_categories",
+        ["quote_category_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        op.f("ix_quote_quote_categories_quote_category_id"),
+        table_name="quote_quote_categories",
+    )
+    op.drop_index(
+        op.f("ix_quote_quote_categories_quote_id"),
+        table_name="quote_quote_categories",
+    )
+    op.drop_index(op.f("ix_forum_posts_thread_id"), table_name="forum_posts")
+    op.drop_index(op.f("ix_forum_threads_source"), table_name="forum_threads")
+    op.drop_index(op.f("ix_emails_parent_id"), table_name="emails")
+    op.drop_index(op.f("ix_emails_thread_id"), table_name="emails")
+    op.drop_index(op.f("ix_email_threads_source"), table_name="email_threads")
+    op.drop_index(
+        "ix_blog_post_translations_locale_slug", table_name="blog_post_translations"
+    )
+    op.drop_index(
+        "ix_document_translations_locale_slug", table_name="document_translations"
+    )
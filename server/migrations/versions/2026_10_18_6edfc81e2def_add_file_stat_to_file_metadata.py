@@ -0,0 +1,29 @@
+"""Add file stat to file_metadata
+
+Revision ID: 6edfc81e2def
+Revises: 006948e4f251
+Create Date: 2026-10-18 10:12:31.402115
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "6edfc81e2def"
+down_revision: Union[str, None] = "006948e4f251"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "file_metadata", sa.Column("mtime_ns", sa.BigInteger(), nullable=True)
+    )
+    op.add_column("file_metadata", sa.Column("size", sa.BigInteger(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("file_metadata", "size")
+    op.drop_column("file_metadata", "mtime_ns")
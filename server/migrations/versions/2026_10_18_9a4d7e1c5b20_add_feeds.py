@@ -0,0 +1,36 @@
+"""Add feeds
+
+Revision ID: 9a4d7e1c5b20
+Revises: 3b9c2f4e8a71
+Create Date: 2026-10-18 12:21:07.593814
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "9a4d7e1c5b20"
+down_revision: Union[str, None] = "3b9c2f4e8a71"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "feeds",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("locale", sa.String(), nullable=False),
+        sa.Column("format", sa.String(), nullable=False),
+        sa.Column("content", sa.LargeBinary(), nullable=False),
+        sa.Column("etag", sa.String(), nullable=False),
+        sa.Column("updated", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_feeds")),
+        sa.UniqueConstraint("name", "locale", "format", name=op.f("uq_feeds_name")),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("feeds")
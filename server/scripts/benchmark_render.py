@@ -0,0 +1,140 @@
+"""
+Compare Markdown rendering with and without the BeautifulSoup URL rewrite.
+
+The current renderer points /static URLs at the CDN while rendering. The
+previous one rendered plain HTML, then parsed and serialized it again with
+BeautifulSoup to rewrite the same URLs. Run from the server directory:
+
+    pip install beautifulsoup4
+    python scripts/benchmark_render.py --largest 5
+
+Without the render cache, each file is rendered `--repeat` times per
+renderer, reporting the best time and the peak traced memory.
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+import tracemalloc
+from typing import Callable
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("ENVIRONMENT", "LOCAL")
+os.environ["RENDER_CACHE_DIR"] = ""
+
+from markdown_it.renderer import RendererHTML  # noqa: E402
+
+from sni.config import settings  # noqa: E402
+from sni.content.markdown.renderer import (  # noqa: E402
+    MDRender,
+    SNIMarkdownRenderer,
+    create_markdown_parser,
+)
+
+CONTENT_GLOB = "content/**/*.md"
+
+
+class PlainRenderer(SNIMarkdownRenderer):
+    """The renderer without the /static rewrites in its render rules."""
+
+    image = RendererHTML.image
+    html_block = RendererHTML.html_block
+    html_inline = RendererHTML.html_inline
+
+    def link_open(self, tokens, idx, options, env) -> str:
+        return self.renderToken(tokens, idx, options, env)
+
+
+def soup_renderer() -> Callable[[str], str]:
+    from bs4 import BeautifulSoup
+
+    md = create_markdown_parser()
+    md.renderer = PlainRenderer(md)
+    md.add_render_rule("math_inline", MDRender.md.renderer.rules["math_inline"])
+    md.add_render_rule("math_block", MDRender.md.renderer.rules["math_block"])
+
+    def render(md_content: str) -> str:
+        soup = BeautifulSoup(md.render(md_content, {}).strip(), "html.parser")
+        for img in soup.find_all("img"):
+            src = img.get("src")
+            if src and src.startswith("/static"):
+                img["src"] = src.replace("/static", settings.CDN_BASE_URL)
+        for a in soup.find_all("a"):
+            href = a.get("href")
+            if href and href.startswith("/static"):
+                a["href"] = href.replace("/static", settings.CDN_BASE_URL)
+        return str(soup)
+
+    return render
+
+
+def token_renderer() -> Callable[[str], str]:
+    def render(md_content: str) -> str:
+        return MDRender.render(md_content)[1]
+
+    return render
+
+
+def measure(render: Callable[[str], str], md_content: str, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        render(md_content)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    render(md_content)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def benchmark(paths: list[str], repeat: int):
+    renderers = {"tokens": token_renderer()}
+    try:
+        renderers["soup"] = soup_renderer()
+    except ImportError:
+        print("beautifulsoup4 is not installed, only timing the current renderer")
+
+    header = "".join(f" {name + ' ms':>10} {name + ' MB':>10}" for name in renderers)
+    print(f"{'file':<40} {'KB':>7}{header}")
+    totals = {name: [0.0, 0] for name in renderers}
+    for path in paths:
+        with open(path, encoding="utf-8") as file:
+            md_content = file.read()
+        row = f"{os.path.basename(path)[:40]:<40} {len(md_content) / 1024:>7.1f}"
+        for name, render in renderers.items():
+            elapsed, peak = measure(render, md_content, repeat)
+            totals[name][0] += elapsed
+            totals[name][1] = max(totals[name][1], peak)
+            row += f" {elapsed * 1000:>10.1f} {peak / 1024 / 1024:>10.2f}"
+        print(row)
+
+    total_row = f"{'total (peak)':<40} {'':>7}"
+    for elapsed, peak in totals.values():
+        total_row += f" {elapsed * 1000:>10.1f} {peak / 1024 / 1024:>10.2f}"
+    print(total_row)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("paths", nargs="*", help="Markdown files to render")
+    parser.add_argument(
+        "--largest", type=int, default=10, help="Render the largest content files"
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    paths = (
+        args.paths
+        or sorted(
+            glob.glob(CONTENT_GLOB, recursive=True), key=os.path.getsize, reverse=True
+        )[: args.largest]
+    )
+    benchmark(paths, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
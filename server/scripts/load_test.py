@@ -0,0 +1,136 @@
+"""
+Measure API throughput at increasing concurrency to find where it saturates.
+
+Run against a server started the way it is deployed, for example:
+
+    gunicorn sni.main:app --workers 4 --worker-class uvicorn.workers.UvicornWorker
+    python scripts/load_test.py --url http://localhost:8000 --no-cache
+
+With `--no-cache` every request carries a unique query parameter so that the
+in-process response cache is bypassed and each request reaches the database.
+"""
+
+import argparse
+import asyncio
+import itertools
+import os
+import statistics
+import time
+
+import httpx
+
+DEFAULT_PATHS = [
+    "/mempool",
+    "/library",
+    "/authors/hal-finney",
+    "/satoshi/emails/cryptography/1",
+    "/satoshi/emails/cryptography/threads/1",
+    "/satoshi/posts/bitcointalk/threads/2",
+]
+DEFAULT_CONCURRENCY = [1, 2, 4, 8, 16, 32, 64]
+
+
+async def worker(
+    client: httpx.AsyncClient,
+    paths: itertools.cycle,
+    counter: itertools.count,
+    deadline: float,
+    no_cache: bool,
+    latencies: list[float],
+    errors: list[int],
+):
+    while time.monotonic() < deadline:
+        params = {"_": next(counter)} if no_cache else None
+        start = time.monotonic()
+        try:
+            response = await client.get(next(paths), params=params)
+            if response.status_code != 200:
+                errors.append(response.status_code)
+                continue
+        except httpx.HTTPError:
+            errors.append(0)
+            continue
+        latencies.append(time.monotonic() - start)
+
+
+async def run_level(
+    url: str, paths: list[str], concurrency: int, duration: float, no_cache: bool
+) -> dict:
+    headers = {"X-API-Key": os.environ["API_KEY"]} if "API_KEY" in os.environ else {}
+    limits = httpx.Limits(max_connections=concurrency)
+    latencies: list[float] = []
+    errors: list[int] = []
+    async with httpx.AsyncClient(
+        base_url=url, headers=headers, limits=limits, timeout=60
+    ) as client:
+        path_cycle = itertools.cycle(paths)
+        counter = itertools.count()
+        start = time.monotonic()
+        deadline = start + duration
+        await asyncio.gather(
+            *(
+                worker(
+                    client, path_cycle, counter, deadline, no_cache, latencies, errors
+                )
+                for _ in range(concurrency)
+            )
+        )
+        elapsed = time.monotonic() - start
+
+    latencies.sort()
+    return {
+        "concurrency": concurrency,
+        "throughput": len(latencies) / elapsed,
+        "p50": statistics.median(latencies) * 1000 if latencies else 0,
+        "p95": latencies[int(len(latencies) * 0.95)] * 1000 if latencies else 0,
+        "errors": len(errors),
+    }
+
+
+async def load_test(
+    url: str,
+    paths: list[str],
+    levels: list[int],
+    duration: float,
+    no_cache: bool,
+):
+    print(f"{'concurrency':>11} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'errors':>7}")
+    best = 0.0
+    for concurrency in levels:
+        result = await run_level(url, paths, concurrency, duration, no_cache)
+        print(
+            f"{result['concurrency']:>11} {result['throughput']:>9.1f} "
+            f"{result['p50']:>9.1f} {result['p95']:>9.1f} {result['errors']:>7}"
+        )
+        # Less than 5% more throughput at a higher concurrency means the
+        # server is saturated, and further requests only queue
+        if best and result["throughput"] < best * 1.05:
+            print(f"Throughput saturates at a concurrency of about {concurrency}")
+            break
+        best = max(best, result["throughput"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--path", action="append", dest="paths")
+    parser.add_argument(
+        "--concurrency", type=int, nargs="+", default=DEFAULT_CONCURRENCY
+    )
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--no-cache", action="store_true")
+    args = parser.parse_args()
+
+    asyncio.run(
+        load_test(
+            args.url,
+            args.paths or DEFAULT_PATHS,
+            args.concurrency,
+            args.duration,
+            args.no_cache,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -8,5 +8,6 @@ class AuthorImporter(MarkdownImporter):
     directory_path = "content/authors"
     content_type = "Author"
     model = Author
+    outputs = (Author,)
     schema = AuthorMDModel
     content_key = "author"
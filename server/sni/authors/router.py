@@ -1,16 +1,18 @@
+from functools import partial
 from typing import Any, List
 
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from sni.constants import LocaleType
-from sni.database import get_db
+from sni.database import gather_queries, get_db
+from sni.shared.cache import CachedRoute
 from sni.shared.schemas import SlugParamModel
 
 from . import service
 from .schemas.response import AuthorDetailModel, AuthorModel
 
-router = APIRouter()
+router = APIRouter(route_class=CachedRoute)
 
 
 @router.get("", response_model=List[AuthorModel])
@@ -33,11 +35,10 @@ async def get_author(
     if not author:
         raise HTTPException(status_code=404, detail="Author not found")
 
-    locales = await service.get_author_locales(author.id, db_session=db)
-
-    library_docs = await service.get_documents(author.id, db_session=db, locale=locale)
-    mempool_posts = await service.get_blog_posts(
-        author.id, db_session=db, locale=locale
+    locales, library_docs, mempool_posts = await gather_queries(
+        partial(service.get_author_locales, author.id),
+        partial(service.get_documents, author.id, locale=locale),
+        partial(service.get_blog_posts, author.id, locale=locale),
     )
     if not library_docs and not mempool_posts:
         raise HTTPException(status_code=404, detail="Author not found")
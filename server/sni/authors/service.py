@@ -10,6 +10,7 @@ from sni.models import (
     BlogPost,
     BlogPostTranslation,
     BlogSeries,
+    BlogSeriesTranslation,
     Document,
     DocumentTranslation,
     blog_post_authors,
@@ -62,7 +63,9 @@ async def get_blog_posts(
             joinedload(BlogPostTranslationAlias.blog_post).options(
                 selectinload(BlogPost.authors),
                 selectinload(BlogPost.translations),
-                joinedload(BlogPost.series).selectinload(BlogSeries.translations),
+                joinedload(BlogPost.series)
+                .selectinload(BlogSeries.translations)
+                .immediateload(BlogSeriesTranslation.blog_series),
             )
         )
         .join(BlogPost)
@@ -1,6 +1,7 @@
 import typer
 from typing_extensions import Annotated
 
+from sni.content.markdown.renderer import MDRender
 from sni.content.update import update_content
 
 app = typer.Typer(help="Manage content.")
@@ -20,5 +21,17 @@ def initialize(
     typer.echo("Finished importing data!")
 
 
+@app.command()
+def clear_cache():
+    """
+    Remove all cached Markdown renders.
+    """
+    if MDRender.cache is None:
+        typer.echo("Render cache is disabled.")
+        return
+    MDRender.cache.clear()
+    typer.echo(f"Cleared render cache in {MDRender.cache.directory}")
+
+
 if __name__ == "__main__":
     app()
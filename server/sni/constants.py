@@ -2,6 +2,7 @@ from enum import Enum, unique
 from typing import Literal
 
 STATIC_ROUTE = "/static"
+READY_ROUTE = "/ready"
 
 
 class Environment(str, Enum):
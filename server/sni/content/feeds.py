@@ -0,0 +1,56 @@
+from typing import Callable, Iterator, NamedTuple
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from sni.constants import LocaleType
+from sni.database import Base
+from sni.mempool.feed import build_mempool_feeds
+from sni.models import Author, BlogPost, BlogPostTranslation, Episode, Feed
+from sni.podcast.feed import build_podcast_feeds
+from sni.shared.feed import FeedFormat, save_feed
+
+FeedBuilder = Callable[[Session], Iterator[tuple[LocaleType, FeedFormat, bytes]]]
+
+
+class FeedSource(NamedTuple):
+    build: FeedBuilder
+    # Models the feed is rendered from
+    inputs: tuple[type[Base], ...]
+
+
+FEED_SOURCES: dict[str, FeedSource] = {
+    "mempool": FeedSource(build_mempool_feeds, (Author, BlogPost, BlogPostTranslation)),
+    "podcast": FeedSource(build_podcast_feeds, (Episode,)),
+}
+
+
+def update_feed(name: str, db_session: Session, force: bool = False) -> bool:
+    """
+    Render a feed in each locale and format and store the bytes, so that
+    feed requests are served without querying or rendering content.
+
+    Unless forced, the feed is only rendered if it hasn't been stored yet.
+    Returns whether any stored feed changed.
+    """
+    print(f"Generating {name} feeds...", end="")
+    stored = db_session.scalar(select(Feed.id).filter_by(name=name).limit(1))
+    if stored is not None and not force:
+        print("DONE")
+        return False
+
+    updated = 0
+    feed_ids = []
+    for locale, format, content in FEED_SOURCES[name].build(db_session):
+        feed = save_feed(name, locale, format, content, db_session=db_session)
+        if feed in db_session.new or feed in db_session.dirty:
+            updated += 1
+        db_session.flush()
+        feed_ids.append(feed.id)
+    # Drop feeds for locales that no longer have any content
+    result = db_session.execute(
+        delete(Feed).where(Feed.name == name, Feed.id.not_in(feed_ids))
+    )
+    print("DONE")
+    print(f"{updated} updated")
+    return bool(updated or result.rowcount)
@@ -1,23 +1,153 @@
+import collections
 import json
+import os
 from datetime import datetime
-from typing import Any, Dict, List, Type
+from itertools import chain, islice
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Sequence,
+    TextIO,
+    Tuple,
+    Type,
+)
 
 from pydantic import BaseModel, ValidationError
-from sqlalchemy import delete, select
+from sqlalchemy import UniqueConstraint, delete, insert, or_, select
 from sqlalchemy.orm import Session
 
+from sni.database import Base
 from sni.models import FileMetadata
+from sni.shared.schemas import get_list_adapter
+from sni.shared.service import LookupCache
+from sni.utils.dates import to_naive_utc
 from sni.utils.files import get_file_hash
 
+from .validation import (
+    get_record_errors,
+    print_record_errors,
+    print_validation_errors,
+)
+
+JSON_WHITESPACE = " \t\n\r"
+
+
+def iter_json_array(file: TextIO, chunk_size: int = 64 * 1024) -> Iterator[Any]:
+    """
+    Parse the items of a top-level JSON array one at a time, reading the file
+    in chunks rather than loading it whole.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    eof = False
+    started = False
+    after_item = False
+    after_comma = False
+
+    while True:
+        while pos < len(buffer) and buffer[pos] in JSON_WHITESPACE:
+            pos += 1
+        if pos == len(buffer):
+            if eof:
+                raise ValueError("Unexpected end of JSON array")
+            chunk = file.read(chunk_size)
+            eof = not chunk
+            buffer, pos = chunk, 0
+            continue
+
+        char = buffer[pos]
+        if not started:
+            if char != "[":
+                raise ValueError("Expected a JSON array")
+            started = True
+            pos += 1
+        elif char == "]":
+            if after_comma:
+                raise ValueError("Expected a value after ',' in JSON array")
+            return
+        elif after_item:
+            if char != ",":
+                raise ValueError(f"Expected ',' or ']' in JSON array, found {char!r}")
+            after_item = False
+            after_comma = True
+            pos += 1
+        else:
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+                # A value not yet followed by a delimiter, like a number, may
+                # continue in the next chunk
+                complete = eof or (
+                    end < len(buffer) and buffer[end] in f"{JSON_WHITESPACE},]"
+                )
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                complete = False
+            if not complete:
+                chunk = file.read(chunk_size)
+                eof = not chunk
+                buffer, pos = buffer[pos:] + chunk, 0
+                continue
+            yield item
+            pos = end
+            after_item = True
+            after_comma = False
+
+
+def batched(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def get_unique_keys(model: Type[Base]) -> List[Tuple[str, ...]]:
+    """Column keys of each unique constraint of a model's table."""
+    table = model.__table__
+    keys = [tuple(column.key for column in table.primary_key)]
+    keys += [(column.key,) for column in table.columns if column.unique]
+    keys += [
+        tuple(column.key for column in constraint.columns)
+        for constraint in table.constraints
+        if isinstance(constraint, UniqueConstraint)
+    ]
+    keys += [
+        tuple(column.key for column in index.columns)
+        for index in table.indexes
+        if index.unique
+    ]
+    return list(dict.fromkeys(keys))
+
 
 class JSONImporter:
     schema: Type[BaseModel]
     dependent_importers: List[Type["JSONImporter"]] = []
+    # Models read and written, from which the import order is derived
+    inputs: Tuple[Type[Base], ...] = ()
+    outputs: Tuple[Type[Base], ...] = ()
+    # Insert rows in batches through Core rather than one ORM object at a time.
+    # Importers that attach relationship-valued fields must turn this off.
+    bulk_insert = True
+    bulk_insert_batch_size = 1000
+    # Parse, validate and write the file a batch of records at a time instead
+    # of loading it whole, so that memory use stays flat as the file grows.
+    streaming = False
+    # Columns that identify a record across imports. When set, a changed file is
+    # synced record by record instead of being deleted and reinserted.
+    natural_key: Tuple[str, ...] | None = None
+    sync_load_options: Sequence = ()
     existing_thread_ids = set()
+    file_created = False
     file_updated = False
 
     def __init__(self, db_session: Session):
         self.db_session = db_session
+        self.lookups = LookupCache(db_session)
+        self.actions = collections.Counter(new=0, updated=0, deleted=0)
         self.fetch_existing_item_ids()
 
     def fetch_existing_item_ids(self):
@@ -26,35 +156,84 @@ class JSONImporter:
 
     def load_json_data(
         self, file_path: str, force: bool = False
-    ) -> List[Dict[str, Any]]:
+    ) -> Iterable[List[Dict[str, Any]]]:
+        """Load the file's validated records in batches, if it needs importing."""
         self.handle_file_metadata(file_path, force)
+        if not (self.file_updated or force):
+            return []
+        if self.streaming:
+            return self.stream_json_data(file_path)
         try:
-            with open(file_path, "r") as file:
-                return json.load(file)
+            with open(file_path, "rb") as file:
+                json_data = file.read()
         except Exception as e:
             print(f"Error loading JSON data: {e}")
             return []
+        return [self.validate_json_data(json_data)]
+
+    def stream_json_data(self, file_path: str) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Parse and validate the file in batches of `bulk_insert_batch_size`
+        records. After an invalid record, the rest of the file is still
+        validated so that every error is reported, but no more batches are
+        returned.
+        """
+        adapter = get_list_adapter(self.schema)
+        errors: Dict[int | None, List[str]] = {}
+        try:
+            file = open(file_path, "r", encoding="utf-8")
+        except Exception as e:
+            print(f"Error loading JSON data: {e}")
+            return
+        with file:
+            records = iter_json_array(file)
+            try:
+                for index, batch in enumerate(
+                    batched(records, self.bulk_insert_batch_size)
+                ):
+                    offset = index * self.bulk_insert_batch_size
+                    try:
+                        validated_batch = adapter.dump_python(
+                            adapter.validate_python(batch)
+                        )
+                    except ValidationError as e:
+                        errors.update(get_record_errors(e, offset=offset))
+                        continue
+                    if not errors:
+                        yield validated_batch
+            except (OSError, ValueError) as e:
+                # Earlier batches may already be written, so the import fails
+                print(f"Error loading JSON data: {e}")
+                raise
+        if errors:
+            print_record_errors(errors)
+            raise ValueError(f"Invalid records in {file_path}")
 
     def handle_file_metadata(self, file_path: str, force: bool = False):
         existing_metadata = self.db_session.scalars(
             select(FileMetadata).filter_by(filename=file_path)
         ).first()
 
-        current_hash = get_file_hash(file_path)
+        current_stat = os.stat(file_path)
         current_last_modified = datetime.now()
 
         if existing_metadata:
-            if existing_metadata.hash != current_hash or force:
-                existing_metadata.hash = current_hash
-                existing_metadata.last_modified = current_last_modified
-                self.file_updated = True
+            # Only hash the file when its size or mtime changed
+            if force or not existing_metadata.matches_stat(current_stat):
+                current_hash = get_file_hash(file_path)
+                if existing_metadata.hash != current_hash or force:
+                    existing_metadata.hash = current_hash
+                    existing_metadata.last_modified = current_last_modified
+                    self.file_updated = True
+                existing_metadata.update_stat(current_stat)
             self.file_metadata = existing_metadata
         else:
             self.file_metadata = FileMetadata(
                 filename=file_path,
-                hash=current_hash,
+                hash=get_file_hash(file_path),
                 last_modified=current_last_modified,
             )
+            self.file_metadata.update_stat(current_stat)
             self.db_session.add(self.file_metadata)
 
             new_file = self.file_model(
@@ -63,13 +242,18 @@ class JSONImporter:
 
             self.db_session.add(new_file)
             self.db_session.flush()
+            self.file_created = True
             self.file_updated = True
 
         self.json_file = self.file_metadata.json_file
 
-        if self.file_updated:
+        if self.file_updated and not self.syncs_incrementally:
             self.delete_all_existing_items()
 
+    @property
+    def syncs_incrementally(self) -> bool:
+        return self.natural_key is not None and not self.file_created
+
     def delete_dependent_entities(self):
         for dependent_importer_cls in self.dependent_importers:
             dependent_importer = dependent_importer_cls(self.db_session)
@@ -79,40 +263,195 @@ class JSONImporter:
         self.delete_dependent_entities()
         self.db_session.execute(delete(self.model))
 
-    def validate_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
+    def delete_items(self, items: Sequence[Any]):
+        """Delete the given rows, and any dependent rows that reference them."""
+        for dependent_importer_cls in self.dependent_importers:
+            dependent_importer = dependent_importer_cls(self.db_session)
+            dependent_importer.delete_items_referencing(self.model, items)
+        item_ids = [item.id for item in items]
+        self.db_session.execute(delete(self.model).where(self.model.id.in_(item_ids)))
+
+    def delete_items_referencing(self, model, items: Sequence[Any]):
+        conditions = [
+            foreign_key.parent.in_(
+                [getattr(item, foreign_key.column.key) for item in items]
+            )
+            for foreign_key in self.model.__table__.foreign_keys
+            if foreign_key.column.table is model.__table__
+        ]
+        if not conditions:
+            return
+        referencing_items = (
+            self.db_session.scalars(select(self.model).where(or_(*conditions)))
+            .unique()
+            .all()
+        )
+        if referencing_items:
+            self.delete_items(referencing_items)
+
+    def validate_json_data(self, json_data: bytes) -> List[Dict[str, Any]]:
+        """
+        Parse and validate every record in one pass, reporting the errors of
+        each invalid record before failing.
+        """
         if not self.schema:
             raise ValueError("Pydantic schema not defined in subclass")
 
+        adapter = get_list_adapter(self.schema)
         try:
-            return self.schema(**data).dict()
+            return adapter.dump_python(adapter.validate_json(json_data))
         except ValidationError as e:
-            print(f"Validation error: {e}")
+            print_validation_errors(e)
             raise
 
     def process_item_data(self, item_data: Dict) -> Dict:
         return item_data
 
-    def process_data(self, json_data: List[Dict[str, Any]]):
-        for item_data in json_data:
-            processed_item_data = self.process_item_data(item_data)
-            new_thread = self.model(**processed_item_data, file_id=self.json_file.id)
-            self.db_session.add(new_thread)
+    def process_data(self, batches: Iterable[List[Dict[str, Any]]]):
+        for json_data in batches:
+            items = [
+                {**self.process_item_data(item_data), "file_id": self.json_file.id}
+                for item_data in json_data
+            ]
+            self.insert_items(items)
+            self.db_session.flush()
+            self.actions["new"] += len(items)
 
-    def commit_changes(self):
-        try:
-            self.db_session.commit()
-        except Exception as e:
-            print(f"Error committing changes to the database: {e}")
-            self.db_session.rollback()
+    def get_natural_key(self, item: Any) -> Tuple[Any, ...]:
+        if isinstance(item, Mapping):
+            return tuple(item[key] for key in self.natural_key)
+        return tuple(getattr(item, key) for key in self.natural_key)
+
+    def sync_data(self, batches: Iterable[List[Dict[str, Any]]]):
+        """
+        Diff the records against the database by natural key and only write the
+        rows that were added, changed or removed.
+
+        Only the keys of existing rows are loaded up front. Rows matching a
+        batch's records are loaded with that batch, and its new records are
+        inserted right away.
+        """
+        unique_keys = get_unique_keys(self.model)
+        # The primary key is the first unique key
+        key_columns = dict.fromkeys(chain(self.natural_key, *unique_keys))
+        existing_ids = {}
+        unique_values = {}
+        for row in self.db_session.execute(
+            select(*(getattr(self.model, key) for key in key_columns))
+        ).mappings():
+            existing_ids[self.get_natural_key(row)] = row["id"]
+            for index, keys in enumerate(unique_keys):
+                unique_values[index, tuple(row[key] for key in keys)] = row["id"]
+        unmatched_ids = set(existing_ids.values())
+
+        def collides_with_unmatched(item: Dict[str, Any]) -> bool:
+            for index, keys in enumerate(unique_keys):
+                values = tuple(item.get(key) for key in keys)
+                if None not in values and (
+                    unique_values.get((index, values)) in unmatched_ids
+                ):
+                    return True
+            return False
+
+        # New rows taking over a unique value, like the id, of a row that may
+        # yet be removed are inserted once removed rows are gone
+        deferred_items = []
+        for json_data in batches:
+            items = [
+                {**self.process_item_data(item_data), "file_id": self.json_file.id}
+                for item_data in json_data
+            ]
+            matched_ids = [
+                existing_ids[key]
+                for key in map(self.get_natural_key, items)
+                if key in existing_ids
+            ]
+            query = (
+                select(self.model)
+                .options(*self.sync_load_options)
+                .where(self.model.id.in_(matched_ids))
+            )
+            existing_items = {
+                self.get_natural_key(item): item
+                for item in self.db_session.scalars(query).unique()
+            }
+            unmatched_ids.difference_update(matched_ids)
+
+            new_items = []
+            for item in items:
+                existing_item = existing_items.get(self.get_natural_key(item))
+                if existing_item is not None:
+                    if self.update_item(existing_item, item):
+                        self.actions["updated"] += 1
+                elif collides_with_unmatched(item):
+                    deferred_items.append(item)
+                else:
+                    new_items.append(item)
+            self.db_session.flush()
+            self.insert_items(new_items)
+            self.db_session.flush()
+            self.actions["new"] += len(new_items)
+
+        removed_ids = list(unmatched_ids)
+        batch_size = self.bulk_insert_batch_size
+        for start in range(0, len(removed_ids), batch_size):
+            query = select(self.model).where(
+                self.model.id.in_(removed_ids[start : start + batch_size])
+            )
+            self.delete_items(self.db_session.scalars(query).unique().all())
+        self.actions["deleted"] += len(removed_ids)
+        self.db_session.flush()
+        self.insert_items(deferred_items)
+        self.actions["new"] += len(deferred_items)
+
+    def update_item(self, existing_item: Any, item_data: Dict[str, Any]) -> bool:
+        updated = False
+        for key, value in item_data.items():
+            current_value = getattr(existing_item, key)
+            if isinstance(value, list):
+                unchanged = set(current_value) == set(value)
+            elif isinstance(value, datetime) and isinstance(current_value, datetime):
+                # DateTime columns store naive UTC timestamps
+                unchanged = to_naive_utc(current_value) == to_naive_utc(value)
+            else:
+                unchanged = current_value == value
+            if not unchanged:
+                setattr(existing_item, key, value)
+                updated = True
+        return updated
+
+    def insert_items(self, items: List[Dict[str, Any]]):
+        if self.bulk_insert:
+            self.bulk_insert_items(items)
+        else:
+            for item in items:
+                self.db_session.add(self.model(**item))
+
+    def bulk_insert_items(self, items: List[Dict[str, Any]]):
+        batch_size = self.bulk_insert_batch_size
+        for start in range(0, len(items), batch_size):
+            self.db_session.execute(
+                insert(self.model), items[start : start + batch_size]
+            )
+
+    def flush_changes(self):
+        # The caller owns the transaction and commits once every importer ran
+        self.db_session.flush()
 
     def import_data(self, force: bool = False):
         print(f"Importing {self.model.__name__}...", end="")
-        json_data = self.load_json_data(self.file_path, force)
+        batches = self.load_json_data(self.file_path, force)
         if self.file_updated or force:
-            validated_data = [self.validate_data(item) for item in json_data]
-            self.process_data(validated_data)
-            self.commit_changes()
+            if self.syncs_incrementally:
+                self.sync_data(batches)
+            else:
+                self.process_data(batches)
+            self.flush_changes()
         print("DONE")
+        if self.file_updated or force:
+            print(
+                "{new} new, {updated} updated, {deleted} deleted".format(**self.actions)
+            )
 
 
 def run_json_importer(
@@ -0,0 +1,110 @@
+import hashlib
+import os
+import pickle
+import shutil
+from typing import Any
+
+
+class CacheUnpickler(pickle.Unpickler):
+    """
+    Unpickler that only loads plain data: builtin containers, strings,
+    numbers and the dates that YAML front matter may contain.
+    """
+
+    allowed_classes = {
+        ("datetime", "date"),
+        ("datetime", "datetime"),
+        ("datetime", "time"),
+        ("datetime", "timedelta"),
+        ("datetime", "timezone"),
+    }
+
+    def find_class(self, module: str, name: str) -> Any:
+        if (module, name) not in self.allowed_classes:
+            raise pickle.UnpicklingError(f"{module}.{name} is not allowed")
+        return super().find_class(module, name)
+
+
+class RenderCache:
+    """
+    On-disk cache of rendered Markdown.
+
+    Entries are keyed by the Markdown source and a fingerprint of everything
+    else that affects the output (renderer code, plugin versions, CDN base
+    URL). Each entry also stores the fingerprint it was rendered with, and is
+    ignored unless it matches. The least recently used entries are evicted
+    once the cache grows past `max_size` bytes.
+    """
+
+    suffix = ".pickle"
+
+    def __init__(self, directory: str, fingerprint: str, max_size: int) -> None:
+        self.directory = directory
+        self.fingerprint = fingerprint
+        self.max_size = max_size
+
+    def key(self, content: str) -> str:
+        h = hashlib.sha256(self.fingerprint.encode())
+        h.update(content.encode("utf-8"))
+        return h.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}{self.suffix}")
+
+    def get(self, key: str) -> Any | None:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as file:
+                entry = CacheUnpickler(file).load()
+            # Bump the mtime so that eviction treats this entry as recently used
+            os.utime(path)
+        except (OSError, EOFError, ValueError, pickle.UnpicklingError):
+            return None
+        if not isinstance(entry, tuple) or len(entry) != 2:
+            return None
+        fingerprint, value = entry
+        if fingerprint != self.fingerprint:
+            return None
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(tmp_path, "wb") as file:
+                pickle.dump(
+                    (self.fingerprint, value), file, protocol=pickle.HIGHEST_PROTOCOL
+                )
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Error writing render cache entry: {e}")
+
+    def prune(self) -> None:
+        """Evict least recently used entries until the cache fits in max_size."""
+        entries = []
+        total_size = 0
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if entry.name.endswith(self.suffix):
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+                        total_size += stat.st_size
+        except FileNotFoundError:
+            return
+
+        if total_size <= self.max_size:
+            return
+
+        for _, size, path in sorted(entries):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total_size -= size
+            if total_size <= self.max_size:
+                break
+
+    def clear(self) -> None:
+        shutil.rmtree(self.directory, ignore_errors=True)
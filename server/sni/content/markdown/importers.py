@@ -2,43 +2,77 @@ import collections
 import os
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import Any, Type
+from functools import cached_property
+from typing import Any, NamedTuple, Type
 
 from pydantic import BaseModel, ValidationError
 from sqlalchemy import select
+from sqlalchemy.orm import Session
 
+from sni.config import settings
 from sni.constants import Locales
-from sni.database import SessionLocalSync
+from sni.database import Base, SessionLocalSync, get_engine_sync
 from sni.models import FileMetadata, MarkdownContent
+from sni.shared.cache import content_version
+from sni.shared.service import LookupCache, defer_content_options
 from sni.utils.files import get_file_hash, split_filename
 
 from .renderer import MDRender
 
 
+class FileRecord(NamedTuple):
+    """An imported file's metadata and the id of the content created from it."""
+
+    metadata: FileMetadata
+    content_id: int
+
+
 class BaseMarkdownImporter(ABC):
     content_type: str
+    # Models read and written, from which the import order is derived
+    inputs: tuple[Type[Base], ...] = ()
+    outputs: tuple[Type[Base], ...] = ()
 
-    def __init__(self):
+    def __init__(self, db_session: Session | None = None):
         self.files_in_db = {}
+        self.file_hashes = {}
+        self.rendered_files = {}
         self.actions = collections.Counter(new=0, updated=0, deleted=0, unchanged=0)
-        self.db_session = SessionLocalSync()
+        # Without a session from the caller, the importer runs in and commits
+        # its own transaction.
+        self.owns_session = db_session is None
+        self.db_session = db_session or SessionLocalSync(bind=get_engine_sync())
+        self.lookups = LookupCache(self.db_session)
         self.force = False
 
     @abstractmethod
     def import_content(self) -> None:
         pass
 
+    @property
+    def has_changes(self) -> bool:
+        return any(self.actions[action] for action in ("new", "updated", "deleted"))
+
+    @cached_property
+    def file_stats(self) -> dict[str, os.stat_result]:
+        with os.scandir(self.directory_path) as entries:
+            return {entry.path: entry.stat() for entry in entries if entry.is_file()}
+
     @property
     def filenames(self):
-        return sorted(os.listdir(self.directory_path))
+        return sorted(os.path.basename(filepath) for filepath in self.file_stats)
 
     def run_import(self, force: bool = False):
         self.force = force
         print(f"Importing {self.content_type}...", end="")
         try:
             self.import_content()
+            if self.owns_session:
+                self.db_session.commit()
+                content_version.bump()
         finally:
-            self.db_session.close()
+            if self.owns_session:
+                self.db_session.close()
         print("DONE")
         print(
             "{new_files} new, {updated_files} updated, {deleted_files} deleted".format(
@@ -58,10 +92,35 @@ class BaseMarkdownImporter(ABC):
             print(f"Validation error: {e}")
             return None
 
+    def render_markdown_file(self, filepath: str) -> tuple[dict | None, str, str]:
+        rendered = self.rendered_files.pop(filepath, None)
+        if rendered is None:
+            rendered = MDRender.process_md(filepath)
+        return rendered
+
+    def _render_changed_files(self, filenames):
+        """
+        Render every new or changed file up front in a process pool so that the
+        database pass only has to apply the results in filename order.
+        """
+        filepaths = []
+        for filename in filenames:
+            filepath = os.path.join(self.directory_path, filename)
+            file_record = self.files_in_db.get(filepath)
+            if not file_record or self._needs_update(file_record, filepath):
+                filepaths.append(filepath)
+
+        rendered = MDRender.process_md_files(
+            filepaths, max_workers=settings.CONTENT_RENDER_WORKERS
+        )
+        self.rendered_files = dict(zip(filepaths, rendered))
+
     def process_markdown_file(
         self, filepath: str, schema: Type[BaseModel]
     ) -> tuple[dict[Any, Any] | None, str, str]:
-        raw_front_matter, html_content, markdown_content = MDRender.process_md(filepath)
+        raw_front_matter, html_content, markdown_content = self.render_markdown_file(
+            filepath
+        )
 
         if raw_front_matter:
             validated_front_matter = self.validate_front_matter(
@@ -73,68 +132,92 @@ class BaseMarkdownImporter(ABC):
         return None, html_content, markdown_content
 
     def _populate_files_from_db(self):
+        # Only the file metadata is needed to tell which files changed, so skip
+        # loading the rendered content of every file
         self.files_in_db = {
-            content.file_metadata.filename: content
-            for content in self.db_session.scalars(
-                select(MarkdownContent).filter_by(content_type=self.content_key)
-            ).all()
+            metadata.filename: FileRecord(metadata, content_id)
+            for metadata, content_id in self.db_session.execute(
+                select(FileMetadata, MarkdownContent.id)
+                .join(MarkdownContent.file_metadata)
+                .filter(MarkdownContent.content_type == self.content_key)
+            )
         }
 
     def _get_file_hash(self, filepath):
-        return get_file_hash(filepath)
-
-    def _needs_update(self, file_record, current_hash, current_timestamp):
-        return self.force or file_record.file_metadata.hash != current_hash
-
-    def _create_new_metadata(self, filepath, current_hash, current_timestamp):
+        if filepath not in self.file_hashes:
+            self.file_hashes[filepath] = get_file_hash(filepath)
+        return self.file_hashes[filepath]
+
+    def _get_file_stat(self, filepath) -> os.stat_result:
+        return self.file_stats.get(filepath) or os.stat(filepath)
+
+    def _needs_update(self, file_record, filepath):
+        if self.force:
+            return True
+
+        metadata = file_record.metadata
+        stat = self._get_file_stat(filepath)
+        if metadata.matches_stat(stat):
+            return False
+        if metadata.hash == self._get_file_hash(filepath):
+            # Touched but not modified. Record the new stat so that the next run
+            # can skip hashing the file.
+            metadata.update_stat(stat)
+            return False
+        return True
+
+    def _create_new_metadata(self, filepath):
+        stat = self._get_file_stat(filepath)
         new_metadata = FileMetadata(
-            filename=filepath, hash=current_hash, last_modified=current_timestamp
+            filename=filepath,
+            hash=self._get_file_hash(filepath),
+            last_modified=datetime.fromtimestamp(stat.st_mtime),
         )
+        new_metadata.update_stat(stat)
         self.db_session.add(new_metadata)
         return new_metadata
 
-    def _update_existing_metadata(self, file_record, current_hash, current_timestamp):
-        current_metadata = file_record.file_metadata
-        current_metadata.hash = current_hash
-        current_metadata.last_modified = current_timestamp
+    def _update_existing_metadata(self, file_record, filepath):
+        stat = self._get_file_stat(filepath)
+        current_metadata = file_record.metadata
+        current_metadata.hash = self._get_file_hash(filepath)
+        current_metadata.last_modified = datetime.fromtimestamp(stat.st_mtime)
+        current_metadata.update_stat(stat)
         self.db_session.add(current_metadata)
         return current_metadata
 
     def _process_deleted_files(self):
         deleted_files_count = len(self.files_in_db)
         for deleted_file in self.files_in_db.values():
-            self.db_session.delete(deleted_file)
+            self.db_session.delete(
+                self.db_session.get(MarkdownContent, deleted_file.content_id)
+            )
         return deleted_files_count
 
 
 class MarkdownImporter(BaseMarkdownImporter):
     def import_content(self):
         self._populate_files_from_db()
+        self._render_changed_files(self.filenames)
 
         for filename in self.filenames:
             action = self._process_file(filename)
             self.actions[action] += 1
 
         self.actions["deleted"] = self._process_deleted_files()
-        self.db_session.commit()
+        self.db_session.flush()
 
     def _process_file(self, filename):
         filepath = os.path.join(self.directory_path, filename)
-        current_hash = self._get_file_hash(filepath)
-        current_timestamp = datetime.fromtimestamp(os.path.getmtime(filepath))
 
         file_record = self.files_in_db.pop(filepath, None)
         new_metadata = None
 
         if not file_record:
-            new_metadata = self._create_new_metadata(
-                filepath, current_hash, current_timestamp
-            )
+            new_metadata = self._create_new_metadata(filepath)
             action = "new"
-        elif self._needs_update(file_record, current_hash, current_timestamp):
-            new_metadata = self._update_existing_metadata(
-                file_record, current_hash, current_timestamp
-            )
+        elif self._needs_update(file_record, filepath):
+            new_metadata = self._update_existing_metadata(file_record, filepath)
             action = "updated"
         else:
             action = "unchanged"
@@ -180,8 +263,8 @@ class MarkdownImporter(BaseMarkdownImporter):
 
 
 class TranslatedMarkdownImporter(BaseMarkdownImporter):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, db_session: Session | None = None):
+        super().__init__(db_session)
         self.content_map = {}
         (
             self.english_filenames,
@@ -203,12 +286,13 @@ class TranslatedMarkdownImporter(BaseMarkdownImporter):
 
     def import_content(self):
         self._populate_files_from_db()
+        self._render_changed_files(self.filenames)
         self._import_english_content()
-        self.db_session.commit()
+        self.db_session.flush()
         self._populate_content_map_from_db()
         self._import_translated_content()
         self.actions["deleted"] = self._process_deleted_files()
-        self.db_session.commit()
+        self.db_session.flush()
 
     def _import_english_content(self):
         for filename in self.english_filenames:
@@ -221,11 +305,15 @@ class TranslatedMarkdownImporter(BaseMarkdownImporter):
             self.actions[action] += 1
 
     def _populate_content_map_from_db(self):
-        all_canonical_entries = self.db_session.query(self.canonical_model).all()
-        for entry in all_canonical_entries:
-            english_translation = next(
-                (t for t in entry.translations if t.locale == Locales.ENGLISH), None
-            )
+        # Load each canonical entry with its English translation in one query,
+        # without the translations' source and HTML
+        english_translations = self.db_session.execute(
+            select(self.canonical_model, self.translation_model)
+            .join(getattr(self.translation_model, self.content_key))
+            .filter(self.translation_model.locale == Locales.ENGLISH)
+            .options(*defer_content_options(self.translation_model))
+        )
+        for entry, english_translation in english_translations:
             self.content_map[english_translation.slug] = {
                 "canonical": entry,
                 "translation": english_translation,
@@ -233,21 +321,15 @@ class TranslatedMarkdownImporter(BaseMarkdownImporter):
 
     def _process_file(self, filename, english=True):
         filepath = os.path.join(self.directory_path, filename)
-        current_hash = get_file_hash(filepath)
-        current_timestamp = datetime.fromtimestamp(os.path.getmtime(filepath))
 
         file_record = self.files_in_db.pop(filepath, None)
         new_metadata = None
 
         if not file_record:
-            new_metadata = self._create_new_metadata(
-                filepath, current_hash, current_timestamp
-            )
+            new_metadata = self._create_new_metadata(filepath)
             action = "new"
-        elif self._needs_update(file_record, current_hash, current_timestamp):
-            new_metadata = self._update_existing_metadata(
-                file_record, current_hash, current_timestamp
-            )
+        elif self._needs_update(file_record, filepath):
+            new_metadata = self._update_existing_metadata(file_record, filepath)
             action = "updated"
         else:
             action = "unchanged"
@@ -262,7 +344,9 @@ class TranslatedMarkdownImporter(BaseMarkdownImporter):
         return action
 
     def _process_canonical_file(self, filepath: str, canonical_schema, schema):
-        front_matter_dict, html_content, file_content = MDRender.process_md(filepath)
+        front_matter_dict, html_content, file_content = self.render_markdown_file(
+            filepath
+        )
         canonical_data = self.validate_front_matter(front_matter_dict, canonical_schema)
         translation_data = self.validate_front_matter(front_matter_dict, schema)
         return canonical_data, translation_data, html_content, file_content
@@ -1,7 +1,13 @@
-from typing import Sequence, cast
+import hashlib
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from importlib.metadata import version
+from typing import Iterator, Sequence
 
 import yaml
-from bs4 import BeautifulSoup
 from markdown_it import MarkdownIt
 from markdown_it.renderer import RendererHTML, RendererProtocol
 from markdown_it.token import Token
@@ -12,6 +18,40 @@ from mdit_py_plugins.footnote import footnote_plugin
 from mdit_py_plugins.front_matter import front_matter_plugin
 
 from sni.config import settings
+from sni.constants import STATIC_ROUTE
+
+from .cache import RenderCache
+
+# Opening <img> and <a> tags in raw HTML, and the attribute of each that may
+# point at a static file.
+STATIC_TAG_RE = re.compile(r"<(img|a)\b[^>]*>", re.IGNORECASE)
+STATIC_TAG_ATTRS = {
+    "img": re.compile(rf"(\ssrc\s*=\s*[\"']?){STATIC_ROUTE}", re.IGNORECASE),
+    "a": re.compile(rf"(\shref\s*=\s*[\"']?){STATIC_ROUTE}", re.IGNORECASE),
+}
+
+
+def static_to_cdn_url(url: str | None) -> str | None:
+    if url and url.startswith(STATIC_ROUTE):
+        return f"{settings.CDN_BASE_URL}{url[len(STATIC_ROUTE):]}"
+    return url
+
+
+def rewrite_static_urls(html_content: str) -> str:
+    """
+    Point `img[src]` and `a[href]` values under /static at the CDN in a
+    fragment of raw HTML.
+    """
+    if STATIC_ROUTE not in html_content:
+        return html_content
+
+    def rewrite_tag(match: re.Match) -> str:
+        attr_re = STATIC_TAG_ATTRS[match.group(1).lower()]
+        return attr_re.sub(
+            lambda attr: f"{attr.group(1)}{settings.CDN_BASE_URL}", match.group(0)
+        )
+
+    return STATIC_TAG_RE.sub(rewrite_tag, html_content)
 
 
 def render_math_inline(
@@ -37,16 +77,81 @@ def render_math_block(
 class SNIMarkdownRenderer(RendererHTML):
     """
     Custom Markdown Renderer that can handle front matter.
-    """
 
-    def __init__(self, *args, **kwargs) -> None:
-        super().__init__(*args, **kwargs)
-        self._front_matter: dict | None = None
+    The parsed front matter is stored in the render `env` rather than on the
+    renderer, so a single parser can be shared across files and threads.
+
+    Links and images under /static are pointed at the CDN as they are
+    rendered, including those written as raw HTML.
+    """
 
     def front_matter(self, tokens, idx, options, env) -> str:
-        self._front_matter = yaml.safe_load(tokens[idx].content)
+        env["front_matter"] = yaml.safe_load(tokens[idx].content)
+        return self.renderToken(tokens, idx, options, env)
+
+    def image(self, tokens, idx, options, env) -> str:
+        token = tokens[idx]
+        src = static_to_cdn_url(token.attrGet("src"))
+        if src is not None:
+            token.attrSet("src", src)
+        return super().image(tokens, idx, options, env)
+
+    def link_open(self, tokens, idx, options, env) -> str:
+        token = tokens[idx]
+        href = static_to_cdn_url(token.attrGet("href"))
+        if href is not None:
+            token.attrSet("href", href)
         return self.renderToken(tokens, idx, options, env)
 
+    def html_block(self, tokens, idx, options, env) -> str:
+        return rewrite_static_urls(super().html_block(tokens, idx, options, env))
+
+    def html_inline(self, tokens, idx, options, env) -> str:
+        return rewrite_static_urls(super().html_inline(tokens, idx, options, env))
+
+
+def create_markdown_parser() -> MarkdownIt:
+    md = (
+        MarkdownIt(
+            "commonmark",
+            {"breaks": False, "html": True},
+            renderer_cls=SNIMarkdownRenderer,
+        )
+        .use(front_matter_plugin)
+        .use(footnote_plugin)
+        .use(deflist_plugin)
+        .use(dollarmath_plugin)
+    )
+
+    md.add_render_rule("math_inline", render_math_inline)
+    md.add_render_rule("math_block", render_math_block)
+
+    return md
+
+
+def renderer_fingerprint() -> str:
+    """
+    Identify everything besides the Markdown source that affects rendered
+    output, so that cached renders are invalidated when any of it changes.
+    """
+    h = hashlib.sha256()
+    with open(__file__, "rb") as file:
+        h.update(file.read())
+    for package in ("markdown-it-py", "mdit-py-plugins", "pyyaml"):
+        h.update(f"{package}=={version(package)}".encode())
+    h.update(f"{settings.CDN_BASE_URL}".encode())
+    return h.hexdigest()
+
+
+def create_render_cache() -> RenderCache | None:
+    if not settings.RENDER_CACHE_DIR:
+        return None
+    return RenderCache(
+        settings.RENDER_CACHE_DIR,
+        fingerprint=renderer_fingerprint(),
+        max_size=settings.RENDER_CACHE_MAX_SIZE,
+    )
+
 
 class MDRender:
     """
@@ -54,46 +159,123 @@ class MDRender:
     Handles front matter using YAML.
     """
 
+    md = create_markdown_parser()
+    cache = create_render_cache()
+    # Process pool shared by every render while `shared_pool` is open
+    pool: ProcessPoolExecutor | None = None
+    pool_workers = 1
+
+    @classmethod
+    def process_html(cls, html_content: str) -> str:
+        return rewrite_static_urls(html_content)
+
     @classmethod
-    def process_html(cls, html_content):
-        soup = BeautifulSoup(html_content, "html.parser")
+    def render(cls, md_content: str) -> tuple[dict | None, str]:
+        env: EnvType = {}
+        html_content = cls.md.render(md_content, env).strip()
 
-        for img in soup.find_all("img"):
-            src = img.get("src")
-            if src and src.startswith("/static"):
-                img["src"] = src.replace("/static", settings.CDN_BASE_URL)
+        return env.get("front_matter"), html_content
 
-        for a in soup.find_all("a"):
-            href = a.get("href")
-            if href and href.startswith("/static"):
-                a["href"] = href.replace("/static", settings.CDN_BASE_URL)
+    @classmethod
+    def render_cached(cls, md_content: str) -> tuple[dict | None, str]:
+        if cls.cache is None:
+            return cls.render(md_content)
 
-        return str(soup)
+        key = cls.cache.key(md_content)
+        rendered = cls.cache.get(key)
+        if rendered is None:
+            rendered = cls.render(md_content)
+            cls.cache.set(key, rendered)
+        return rendered
 
     @classmethod
     def process_md(cls, md_file_path: str) -> tuple[dict | None, str, str]:
-        md = (
-            MarkdownIt(
-                "commonmark",
-                {"breaks": False, "html": True},
-                renderer_cls=SNIMarkdownRenderer,
-            )
-            .use(front_matter_plugin)
-            .use(footnote_plugin)
-            .use(deflist_plugin)
-            .use(dollarmath_plugin)
+        file_content = cls._get_file_content(md_file_path)
+        front_matter, html_content = cls.render_cached(file_content)
+
+        return front_matter, html_content, file_content
+
+    @staticmethod
+    def create_pool(max_workers: int) -> ProcessPoolExecutor:
+        # Content is imported from several threads at once, and forking a
+        # threaded process can leave the children deadlocked
+        return ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("forkserver"),
         )
 
-        md.add_render_rule("math_inline", render_math_inline)
-        md.add_render_rule("math_block", render_math_block)
+    @classmethod
+    @contextmanager
+    def shared_pool(cls, max_workers: int | None = None) -> Iterator[None]:
+        """
+        Render in one process pool until the block exits, so that importers
+        running concurrently share its workers rather than each starting a
+        pool of `max_workers`. Workers are only started once there is
+        something to render.
+        """
+        max_workers = max_workers or os.cpu_count() or 1
+        if max_workers == 1:
+            yield
+            return
 
-        file_content = cls._get_file_content(md_file_path)
-        html_content = md.render(file_content).strip()
-        processed_html_content = cls.process_html(html_content)
+        with cls.create_pool(max_workers) as pool:
+            cls.pool, cls.pool_workers = pool, max_workers
+            try:
+                yield
+            finally:
+                cls.pool, cls.pool_workers = None, 1
+
+    @classmethod
+    def process_md_files(
+        cls, md_file_paths: Sequence[str], max_workers: int | None = None
+    ) -> list[tuple[dict | None, str, str]]:
+        """
+        Render many Markdown files, fanning the work out to a process pool.
+        Results are returned in the same order as `md_file_paths`.
+
+        Files with a cached render are served from the cache in this process,
+        and only the remainder is sent to the pool. Inside `shared_pool`, that
+        pool is used and `max_workers` is ignored.
+        """
+        rendered = {}
+        uncached_file_paths = []
+        for md_file_path in md_file_paths:
+            file_content = cls._get_file_content(md_file_path)
+            cached = cls.cache.get(cls.cache.key(file_content)) if cls.cache else None
+            if cached is None:
+                uncached_file_paths.append(md_file_path)
+            else:
+                rendered[md_file_path] = (*cached, file_content)
+
+        if cls.pool is not None:
+            max_workers = cls.pool_workers
+        else:
+            max_workers = max_workers or os.cpu_count() or 1
+
+        if max_workers == 1 or len(uncached_file_paths) < 2:
+            results = [cls.process_md(path) for path in uncached_file_paths]
+        else:
+            max_workers = min(max_workers, len(uncached_file_paths))
+            chunksize = max(1, len(uncached_file_paths) // (max_workers * 4))
+            if cls.pool is not None:
+                results = list(
+                    cls.pool.map(
+                        cls.process_md, uncached_file_paths, chunksize=chunksize
+                    )
+                )
+            else:
+                with cls.create_pool(max_workers) as executor:
+                    results = list(
+                        executor.map(
+                            cls.process_md, uncached_file_paths, chunksize=chunksize
+                        )
+                    )
+        rendered.update(zip(uncached_file_paths, results))
 
-        renderer = cast(SNIMarkdownRenderer, md.renderer)
+        if cls.cache is not None:
+            cls.cache.prune()
 
-        return renderer._front_matter, processed_html_content, file_content
+        return [rendered[md_file_path] for md_file_path in md_file_paths]
 
     @classmethod
     def _get_file_content(cls, md_file_path: str) -> str:
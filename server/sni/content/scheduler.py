@@ -0,0 +1,231 @@
+import io
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AbstractContextManager, contextmanager
+from dataclasses import dataclass
+from typing import Callable, Sequence, TextIO
+
+from sqlalchemy.orm import Session
+
+from sni.database import Base
+
+
+@dataclass
+class ImportTask:
+    """
+    A stage of the content update. A task depends on every task that outputs
+    one of its inputs.
+    """
+
+    name: str
+    # Called with the branch's session and whether to force a full import.
+    # Returns whether anything changed.
+    run: Callable[[Session, bool], bool]
+    inputs: tuple[type[Base], ...] = ()
+    outputs: tuple[type[Base], ...] = ()
+    # Whether a change to any of its inputs forces the task to import in full
+    follows_inputs: bool = True
+
+
+@dataclass
+class TaskTiming:
+    name: str
+    branch: int
+    start: float
+    end: float
+
+    @property
+    def elapsed(self) -> float:
+        return self.end - self.start
+
+
+class BranchOutput(io.TextIOBase):
+    """
+    Stands in for stdout while branches run. A branch's output is held back
+    until the branch finishes and then written in one block, so that the
+    progress lines of concurrent branches don't interleave. Output from
+    other threads is written through.
+    """
+
+    def __init__(self, stream: TextIO):
+        self.stream = stream
+        self.local = threading.local()
+        self.lock = threading.Lock()
+
+    def write(self, text: str) -> int:
+        buffer = getattr(self.local, "buffer", None)
+        if buffer is not None:
+            return buffer.write(text)
+        with self.lock:
+            return self.stream.write(text)
+
+    def flush(self):
+        if getattr(self.local, "buffer", None) is None:
+            self.stream.flush()
+
+    @contextmanager
+    def held_back(self):
+        self.local.buffer = io.StringIO()
+        try:
+            yield
+        finally:
+            output = self.local.buffer.getvalue()
+            self.local.buffer = None
+            with self.lock:
+                self.stream.write(output)
+                self.stream.flush()
+
+
+class ImportScheduler:
+    """
+    Run import tasks in dependency order.
+
+    Tasks connected by dependencies form a branch, which runs in order in a
+    single transaction so that it is committed all or nothing. Independent
+    branches run concurrently, each on its own connection, and each branch's
+    output is printed once it finishes.
+    """
+
+    def __init__(
+        self,
+        tasks: Sequence[ImportTask],
+        session_scope: Callable[[], AbstractContextManager[Session]],
+        max_workers: int | None = None,
+    ):
+        self.tasks = tasks
+        self.session_scope = session_scope
+        self.max_workers = max_workers
+        self.dependencies = {
+            task.name: [
+                other
+                for other in tasks
+                if other is not task and set(task.inputs) & set(other.outputs)
+            ]
+            for task in tasks
+        }
+        self.changed: dict[str, bool] = {}
+        self.timings: list[TaskTiming] = []
+
+    def ordered_tasks(self) -> list[ImportTask]:
+        """Sort the tasks topologically, keeping independent tasks in order."""
+        ordered: list[ImportTask] = []
+        remaining = list(self.tasks)
+        while remaining:
+            task = next(
+                (
+                    task
+                    for task in remaining
+                    if all(dep in ordered for dep in self.dependencies[task.name])
+                ),
+                None,
+            )
+            if task is None:
+                names = ", ".join(task.name for task in remaining)
+                raise ValueError(f"Import tasks have a dependency cycle: {names}")
+            ordered.append(task)
+            remaining.remove(task)
+        return ordered
+
+    def branches(self) -> list[list[ImportTask]]:
+        """Group the tasks into independent branches, each in dependency order."""
+        roots = {task.name: task.name for task in self.tasks}
+
+        def find_root(name: str) -> str:
+            while roots[name] != name:
+                name = roots[name]
+            return name
+
+        for name, dependencies in self.dependencies.items():
+            for dependency in dependencies:
+                roots[find_root(dependency.name)] = find_root(name)
+
+        branches: dict[str, list[ImportTask]] = {}
+        for task in self.ordered_tasks():
+            branches.setdefault(find_root(task.name), []).append(task)
+        return list(branches.values())
+
+    def run(self, force: bool = False) -> bool:
+        """
+        Run every branch, and return whether anything changed. If a branch
+        fails, the others still run and commit before the error is raised.
+        """
+        self.start = time.perf_counter()
+        branches = self.branches()
+        stdout = sys.stdout
+        self.output = sys.stdout = BranchOutput(stdout)
+        try:
+            with ThreadPoolExecutor(
+                max_workers=self.max_workers or len(branches)
+            ) as executor:
+                futures = [
+                    executor.submit(self.run_branch, index, branch, force)
+                    for index, branch in enumerate(branches)
+                ]
+        finally:
+            sys.stdout = stdout
+        self.end = time.perf_counter()
+
+        for future in futures:
+            if future.exception() is not None:
+                raise future.exception()
+        return any(self.changed.values())
+
+    def run_branch(self, index: int, branch: list[ImportTask], force: bool):
+        with self.output.held_back(), self.session_scope() as db_session:
+            for task in branch:
+                inputs_changed = task.follows_inputs and any(
+                    self.changed[dependency.name]
+                    for dependency in self.dependencies[task.name]
+                )
+                with self.timed(task.name, index):
+                    changed = task.run(db_session, force or inputs_changed)
+                # Rows reimported because an input changed count as changed
+                self.changed[task.name] = changed or inputs_changed
+
+            with self.timed("Commit", index):
+                db_session.commit()
+
+    @contextmanager
+    def timed(self, name: str, branch: int):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings.append(
+                TaskTiming(
+                    name=name,
+                    branch=branch,
+                    start=start - self.start,
+                    end=time.perf_counter() - self.start,
+                )
+            )
+
+    def print_timing_report(self):
+        """
+        Print each branch's task timings, and the branch that finished last,
+        which is the critical path of the update.
+        """
+        if not self.timings:
+            return
+        width = max(len(timing.name) for timing in self.timings)
+        critical_branch = max(self.timings, key=lambda timing: timing.end).branch
+
+        print("Content update timings (start, elapsed):")
+        for branch in sorted({timing.branch for timing in self.timings}):
+            marker = " (critical path)" if branch == critical_branch else ""
+            print(f"  Branch {branch + 1}{marker}")
+            for timing in self.timings:
+                if timing.branch == branch:
+                    print(
+                        f"    {timing.name:<{width}}  {timing.start:8.3f}s"
+                        f"  {timing.elapsed:8.3f}s"
+                    )
+
+        critical_path = [
+            timing.name for timing in self.timings if timing.branch == critical_branch
+        ]
+        task_time = sum(timing.elapsed for timing in self.timings)
+        print(f"  Critical path: {' -> '.join(critical_path)}")
+        print(f"  Task time: {task_time:.3f}s, wall time: {self.end - self.start:.3f}s")
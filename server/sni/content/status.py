@@ -0,0 +1,62 @@
+from datetime import datetime, timezone
+from enum import Enum
+
+
+class ContentUpdateState(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    READY = "ready"
+    FAILED = "failed"
+
+    @property
+    def in_progress(self) -> bool:
+        return self in (self.PENDING, self.RUNNING)
+
+
+class ContentUpdateStatus:
+    """
+    Progress of the content update run in the background at startup.
+
+    Content is considered ready until an update is scheduled, so deployments
+    that import content out of band report ready immediately.
+    """
+
+    def __init__(self) -> None:
+        self.state = ContentUpdateState.READY
+        self.started_at: datetime | None = None
+        self.finished_at: datetime | None = None
+        self.error: str | None = None
+
+    @property
+    def is_ready(self) -> bool:
+        return self.state == ContentUpdateState.READY
+
+    def mark_pending(self) -> None:
+        self.state = ContentUpdateState.PENDING
+        self.started_at = None
+        self.finished_at = None
+        self.error = None
+
+    def mark_running(self) -> None:
+        self.state = ContentUpdateState.RUNNING
+        self.started_at = datetime.now(timezone.utc)
+
+    def mark_ready(self) -> None:
+        self.state = ContentUpdateState.READY
+        self.finished_at = datetime.now(timezone.utc)
+
+    def mark_failed(self, error: Exception) -> None:
+        self.state = ContentUpdateState.FAILED
+        self.finished_at = datetime.now(timezone.utc)
+        self.error = str(error)
+
+    def to_dict(self) -> dict:
+        return {
+            "status": self.state.value,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "error": self.error,
+        }
+
+
+content_update_status = ContentUpdateStatus()
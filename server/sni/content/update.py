@@ -1,24 +1,36 @@
+import asyncio
 import logging
 from contextlib import contextmanager
+from typing import Type
+
+from sqlalchemy.orm import Session
 
 from sni.authors.importers import AuthorImporter
-from sni.database import SessionLocalSync
+from sni.config import settings
+from sni.database import SessionLocalSync, get_engine_sync
 from sni.library.importers import LibraryImporter, LibraryWeightImporter
 from sni.mempool.importers import MempoolImporter, MempoolSeriesImporter
+from sni.models import Feed
 from sni.podcast.importers import EpisodeImporter
 from sni.satoshi.emails.importers import EmailImporter, EmailThreadImporter
 from sni.satoshi.posts.importers import ForumPostImporter, ForumThreadImporter
 from sni.satoshi.quotes.importers import QuoteCategoryImporter, QuoteImporter
+from sni.shared.cache import content_version
 from sni.skeptics.importers import SkepticImporter
 from sni.translators.importers import TranslatorImporter
 
-from .json import run_json_importer
-from .yaml import run_weight_importer
+from .feeds import FEED_SOURCES, update_feed
+from .json import JSONImporter, run_json_importer
+from .markdown.importers import BaseMarkdownImporter
+from .markdown.renderer import MDRender
+from .scheduler import ImportScheduler, ImportTask
+from .status import content_update_status
+from .yaml import WeightImporter, run_weight_importer
 
 
 @contextmanager
 def session_scope():
-    db_session = SessionLocalSync()
+    db_session = SessionLocalSync(bind=get_engine_sync())
     try:
         yield db_session
         db_session.commit()
@@ -30,53 +42,105 @@ def session_scope():
         db_session.close()
 
 
-def update_content(force: bool = False):
-    with session_scope() as db_session:
-        # Import emails
-        email_thread_updated = run_json_importer(EmailThreadImporter, db_session, force)
-        email_updated = run_json_importer(
-            EmailImporter, db_session, force, [email_thread_updated]
-        )
-
-        # Import forum posts
-        forum_thread_updated = run_json_importer(ForumThreadImporter, db_session, force)
-        forum_post_updated = run_json_importer(
-            ForumPostImporter, db_session, force, [forum_thread_updated]
-        )
-
-        # Import quotes
-        quote_category_updated = run_json_importer(
-            QuoteCategoryImporter, db_session, force
-        )
-        run_json_importer(
-            QuoteImporter,
-            db_session,
-            force,
-            [
-                email_thread_updated,
-                email_updated,
-                forum_thread_updated,
-                forum_post_updated,
-                quote_category_updated,
-            ],
-        )
-
-        # Import skeptics
-        run_json_importer(SkepticImporter, db_session, force)
-
-    # Import markdown content
-    importers = [
-        AuthorImporter,
-        TranslatorImporter,
-        LibraryImporter,
-        MempoolSeriesImporter,
-        MempoolImporter,
-        EpisodeImporter,
+def json_task(importer_cls: Type[JSONImporter]) -> ImportTask:
+    return ImportTask(
+        name=importer_cls.__name__,
+        run=lambda db_session, force: run_json_importer(
+            importer_cls, db_session, force
+        ),
+        inputs=importer_cls.inputs,
+        outputs=importer_cls.outputs,
+    )
+
+
+def markdown_task(importer_cls: Type[BaseMarkdownImporter]) -> ImportTask:
+    def run(db_session: Session, force: bool) -> bool:
+        importer = importer_cls(db_session)
+        importer.run_import(force)
+        return importer.has_changes
+
+    # Markdown files reference related content by slug, so a file only needs
+    # importing again when it changes itself
+    return ImportTask(
+        name=importer_cls.__name__,
+        run=run,
+        inputs=importer_cls.inputs,
+        outputs=importer_cls.outputs,
+        follows_inputs=False,
+    )
+
+
+def weight_task(importer_cls: Type[WeightImporter]) -> ImportTask:
+    return ImportTask(
+        name=importer_cls.__name__,
+        run=lambda db_session, force: run_weight_importer(
+            importer_cls, db_session, force
+        ),
+        inputs=importer_cls.inputs,
+        outputs=importer_cls.outputs,
+    )
+
+
+def feed_task(name: str) -> ImportTask:
+    return ImportTask(
+        name=f"{name.capitalize()}Feeds",
+        run=lambda db_session, force: update_feed(name, db_session, force),
+        inputs=FEED_SOURCES[name].inputs,
+        outputs=(Feed,),
+    )
+
+
+def import_tasks() -> list[ImportTask]:
+    return [
+        json_task(EmailThreadImporter),
+        json_task(EmailImporter),
+        json_task(ForumThreadImporter),
+        json_task(ForumPostImporter),
+        json_task(QuoteCategoryImporter),
+        json_task(QuoteImporter),
+        json_task(SkepticImporter),
+        markdown_task(AuthorImporter),
+        markdown_task(TranslatorImporter),
+        markdown_task(LibraryImporter),
+        markdown_task(MempoolSeriesImporter),
+        markdown_task(MempoolImporter),
+        markdown_task(EpisodeImporter),
+        weight_task(LibraryWeightImporter),
+        *(feed_task(name) for name in FEED_SOURCES),
     ]
-    for importer in importers:
-        instance = importer()
-        instance.run_import(force)
 
-    weight_importers = [LibraryWeightImporter]
-    for importer in weight_importers:
-        run_weight_importer(LibraryWeightImporter, db_session, force)
+
+def update_content(force: bool = False):
+    """
+    Import all data and content files. Importers run after the importers
+    whose output they read, with a change to an input forcing a full import.
+
+    Importers that depend on each other are committed together, all or
+    nothing, while independent branches run concurrently and are committed
+    separately. Concurrent Markdown imports render in one shared process pool.
+    """
+    scheduler = ImportScheduler(
+        import_tasks(), session_scope, max_workers=settings.CONTENT_IMPORT_WORKERS
+    )
+    try:
+        with MDRender.shared_pool(settings.CONTENT_RENDER_WORKERS):
+            scheduler.run(force)
+    finally:
+        # Branches that succeeded are committed even if another one failed
+        content_version.bump()
+    scheduler.print_timing_report()
+
+
+async def update_content_in_background(force: bool = False):
+    """
+    Run `update_content` in a worker thread so the event loop keeps serving
+    requests, recording progress in `content_update_status`.
+    """
+    content_update_status.mark_running()
+    try:
+        await asyncio.to_thread(update_content, force)
+    except Exception as e:
+        logging.exception("Background content update failed")
+        content_update_status.mark_failed(e)
+    else:
+        content_update_status.mark_ready()
@@ -0,0 +1,35 @@
+from collections import defaultdict
+
+from pydantic import ValidationError
+
+
+def get_record_errors(
+    error: ValidationError, records_loc: tuple = (), offset: int = 0
+) -> dict[int | None, list[str]]:
+    """
+    Group validation errors by the index of the record they belong to, where
+    the records are the list found at `records_loc`, starting at `offset`.
+    """
+    errors_by_record: dict[int | None, list[str]] = defaultdict(list)
+    for details in error.errors():
+        loc = details["loc"]
+        index = None
+        if loc[: len(records_loc)] == records_loc and len(loc) > len(records_loc):
+            index = offset + int(loc[len(records_loc)])
+            loc = loc[len(records_loc) + 1 :]
+        field = ".".join(str(part) for part in loc) or "(record)"
+        errors_by_record[index].append(f"{field}: {details['msg']}")
+    return errors_by_record
+
+
+def print_record_errors(errors_by_record: dict[int | None, list[str]]):
+    record_count = sum(index is not None for index in errors_by_record)
+    print(f"Validation error: {record_count} invalid records")
+    for index, messages in errors_by_record.items():
+        print(f"  Record {index}:" if index is not None else "  File:")
+        for message in messages:
+            print(f"    {message}")
+
+
+def print_validation_errors(error: ValidationError, records_loc: tuple = ()):
+    print_record_errors(get_record_errors(error, records_loc))
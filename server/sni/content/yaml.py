@@ -1,3 +1,4 @@
+import os
 from datetime import datetime
 from typing import Any, Sequence, Type
 
@@ -8,8 +9,11 @@ from sqlalchemy.orm import Session
 
 from sni.database import Base
 from sni.models import FileMetadata, YAMLFile
+from sni.shared.schemas import get_type_adapter
 from sni.utils.files import get_file_hash
 
+from .validation import print_validation_errors
+
 
 class SlugWeight(BaseModel):
     slug: str
@@ -25,6 +29,9 @@ class WeightImporter:
     file_model: Type[YAMLFile]
     file_updated = False
     schema = SlugWeights
+    # Models read and written, from which the import order is derived
+    inputs: tuple[type[Base], ...] = ()
+    outputs: tuple[type[Base], ...] = ()
 
     def __init__(self, db_session: Session):
         self.db_session = db_session
@@ -33,6 +40,8 @@ class WeightImporter:
         self, file_path: str, force: bool = False
     ) -> list[dict[str, Any]]:
         self.handle_file_metadata(file_path, force)
+        if not (self.file_updated or force):
+            return []
         try:
             with open(file_path, "r") as file:
                 return yaml.safe_load(file)
@@ -45,21 +54,26 @@ class WeightImporter:
             select(FileMetadata).filter_by(filename=file_path)
         ).first()
 
-        current_hash = get_file_hash(file_path)
+        current_stat = os.stat(file_path)
         current_last_modified = datetime.now()
 
         if existing_metadata:
-            if existing_metadata.hash != current_hash or force:
-                existing_metadata.hash = current_hash
-                existing_metadata.last_modified = current_last_modified
-                self.file_updated = True
+            # Only hash the file when its size or mtime changed
+            if force or not existing_metadata.matches_stat(current_stat):
+                current_hash = get_file_hash(file_path)
+                if existing_metadata.hash != current_hash or force:
+                    existing_metadata.hash = current_hash
+                    existing_metadata.last_modified = current_last_modified
+                    self.file_updated = True
+                existing_metadata.update_stat(current_stat)
             self.file_metadata = existing_metadata
         else:
             self.file_metadata = FileMetadata(
                 filename=file_path,
-                hash=current_hash,
+                hash=get_file_hash(file_path),
                 last_modified=current_last_modified,
             )
+            self.file_metadata.update_stat(current_stat)
             self.db_session.add(self.file_metadata)
 
             new_file = self.file_model(
@@ -90,18 +104,16 @@ class WeightImporter:
         if not self.schema:
             raise ValueError("Pydantic schema not defined in subclass")
 
+        adapter = get_type_adapter(self.schema)
         try:
-            return self.schema(**data).dict()
+            return adapter.dump_python(adapter.validate_python(data))
         except ValidationError as e:
-            print(f"Validation error: {e}")
+            print_validation_errors(e, records_loc=("weights",))
             raise
 
-    def commit_changes(self):
-        try:
-            self.db_session.commit()
-        except Exception as e:
-            print(f"Error committing changes to the database: {e}")
-            self.db_session.rollback()
+    def flush_changes(self):
+        # The caller owns the transaction and commits once every importer ran
+        self.db_session.flush()
 
     def import_data(self, force: bool = False):
         print(f"Importing weights for {self.model.__name__}...", end="")
@@ -113,7 +125,7 @@ class WeightImporter:
                 item["slug"]: item["weight"] for item in validated_data["weights"]
             }
             self.process_data(self.items, slug_weights)
-            self.commit_changes()
+            self.flush_changes()
         print("DONE")
 
 
@@ -1,14 +1,62 @@
-from sqlalchemy import MetaData, create_engine
+import asyncio
+from functools import cache
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy import Engine, MetaData, create_engine, make_url
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
 
 from .config import settings
 
-engine = create_async_engine(settings.SQLALCHEMY_DATABASE_URI)
+
+def pool_options() -> dict[str, Any]:
+    """
+    Connection pool settings for the web server's engine.
+
+    With DB_MAX_CONNECTIONS set, the connections are split evenly between the
+    WEB_CONCURRENCY workers, each of which has its own pool.
+    """
+    url = make_url(settings.SQLALCHEMY_DATABASE_URI)
+    # SQLite connections aren't pooled
+    if url.get_backend_name() == "sqlite":
+        return {}
+
+    pool_size = settings.DB_POOL_SIZE
+    max_overflow = settings.DB_MAX_OVERFLOW
+    if settings.DB_MAX_CONNECTIONS is not None:
+        per_worker = max(1, settings.DB_MAX_CONNECTIONS // settings.WEB_CONCURRENCY)
+        pool_size = min(pool_size, per_worker)
+        max_overflow = min(max_overflow, per_worker - pool_size)
+
+    options: dict[str, Any] = {
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if url.get_driver_name() == "psycopg":
+        # Statements executed this many times on a connection are prepared
+        # server side. None disables preparing, as needed behind PgBouncer.
+        options["connect_args"] = {"prepare_threshold": settings.DB_PREPARE_THRESHOLD}
+    return options
+
+
+engine = create_async_engine(settings.SQLALCHEMY_DATABASE_URI, **pool_options())
 SessionLocal = async_sessionmaker(bind=engine)
 
-engine_sync = create_engine(settings.SQLALCHEMY_DATABASE_URI)
-SessionLocalSync = sessionmaker(autocommit=False, autoflush=False, bind=engine_sync)
+
+@cache
+def get_engine_sync() -> Engine:
+    """
+    Engine for the CLI and content importers, created on first use so that
+    web workers don't set one up.
+    """
+    return create_engine(settings.SQLALCHEMY_DATABASE_URI)
+
+
+# Bound on use with `SessionLocalSync(bind=get_engine_sync())`
+SessionLocalSync = sessionmaker(autocommit=False, autoflush=False)
 
 
 async def get_db():
@@ -16,6 +64,23 @@ async def get_db():
         yield session
 
 
+async def gather_queries(*queries: Callable[..., Awaitable[Any]]) -> list[Any]:
+    """
+    Run independent read queries concurrently. Each query is called with its
+    own `db_session` keyword argument, so that each runs on a separate pooled
+    connection rather than waiting its turn on a shared session.
+
+    Results are returned in the same order as `queries`. Anything they need in
+    the response must be loaded eagerly, as the sessions are closed on return.
+    """
+
+    async def run(query: Callable[..., Awaitable[Any]]) -> Any:
+        async with SessionLocal() as session:
+            return await query(db_session=session)
+
+    return await asyncio.gather(*(run(query) for query in queries))
+
+
 class Base(DeclarativeBase):
     metadata = MetaData(
         naming_convention={
@@ -8,7 +8,6 @@ from sni.models import (
     LibraryWeightFile,
     Translator,
 )
-from sni.shared.service import get, get_or_create
 
 from .schemas import (
     DocumentCanonicalMDModel,
@@ -21,6 +20,8 @@ class LibraryWeightImporter(WeightImporter):
     file_path = "data/weights/library.yaml"
     model = DocumentTranslation
     parent = "document"
+    inputs = (Document, DocumentTranslation)
+    outputs = (Document,)
     file_model = LibraryWeightFile
     content_type = "library_weights"
 
@@ -34,10 +35,12 @@ class LibraryImporter(TranslatedMarkdownImporter):
     md_schema = DocumentMDModel
     translation_schema = DocumentTranslationMDModel
     content_key = "document"
+    inputs = (Author, Translator)
+    outputs = (Document, DocumentTranslation, DocumentFormat)
 
     def process_canonical_additional_data(self, canonical_data):
         canonical_data["authors"] = [
-            get(Author, db_session=self.db_session, slug=author)
+            self.lookups.get(Author, slug=author)
             for author in canonical_data.pop("authors", [])
         ]
         return canonical_data
@@ -46,11 +49,11 @@ class LibraryImporter(TranslatedMarkdownImporter):
         self, translation_data, canonical_entry, metadata
     ):
         translation_data["formats"] = [
-            get_or_create(DocumentFormat, db_session=self.db_session, format_type=fmt)
+            self.lookups.get_or_create(DocumentFormat, format_type=fmt)
             for fmt in translation_data.pop("formats", [])
         ]
         translation_data["translators"] = [
-            get(Translator, db_session=self.db_session, slug=slug)
+            self.lookups.get(Translator, slug=slug)
             for slug in translation_data.pop("translators", [])
         ]
         return super().process_translation_additional_data(
@@ -64,11 +67,11 @@ class LibraryImporter(TranslatedMarkdownImporter):
             translation_data.get("external") or canonical_entry["translation"].external
         )
         translation_data["formats"] = [
-            get_or_create(DocumentFormat, db_session=self.db_session, format_type=fmt)
+            self.lookups.get_or_create(DocumentFormat, format_type=fmt)
             for fmt in translation_data.pop("formats")
         ]
         translation_data["translators"] = [
-            get(Translator, db_session=self.db_session, slug=slug)
+            self.lookups.get(Translator, slug=slug)
             for slug in translation_data.pop("translators", [])
         ]
 
@@ -1,23 +1,33 @@
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from sni.constants import LocaleType
 from sni.database import get_db
+from sni.shared.cache import CachedRoute
+from sni.shared.pagination import PageParams, page_response
+from sni.shared.projection import FieldsParams, project_fields
 from sni.shared.schemas import SlugParamModel
 
 from . import service
 from .schemas import DocumentIndexModel, DocumentModel
 
-router = APIRouter()
+router = APIRouter(route_class=CachedRoute)
 
 
 @router.get("", response_model=list[DocumentIndexModel])
 async def get_library_docs(
-    locale: LocaleType = "en", db: AsyncSession = Depends(get_db)
+    request: Request,
+    response: Response,
+    locale: LocaleType = "en",
+    page: PageParams = Depends(),
+    fields: FieldsParams = Depends(),
+    db: AsyncSession = Depends(get_db),
 ) -> Any:
-    return await service.get_all_by_locale(db_session=db, locale=locale)
+    docs = await service.get_all_by_locale(db_session=db, locale=locale, page=page)
+    items = page_response(docs, request, response)
+    return project_fields(items, DocumentIndexModel, fields, response)
 
 
 @router.get("/params", response_model=list[SlugParamModel])
@@ -1,11 +1,11 @@
-from typing import Sequence
-
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload, selectinload
 
 from sni.constants import LocaleType
 from sni.models import Document, DocumentTranslation
+from sni.shared.pagination import Keyset, KeysetColumn, Page, PageParams, fetch_page
+from sni.shared.service import defer_content_options, index_content_options
 
 
 async def get(
@@ -35,22 +35,30 @@ async def get_params(*, db_session: AsyncSession) -> list[dict[str, LocaleType]]
     return [dict(slug=slug, locale=locale) for (slug, locale) in all_params]
 
 
+doc_keyset = Keyset(
+    KeysetColumn(Document.weight, lambda doc: doc.document.weight, descending=True),
+    KeysetColumn(DocumentTranslation.sort_title, lambda doc: doc.sort_title),
+    KeysetColumn(DocumentTranslation.id, lambda doc: doc.id),
+)
+
+
 async def get_all_by_locale(
-    *, db_session: AsyncSession, locale: LocaleType
-) -> Sequence[DocumentTranslation]:
+    *, db_session: AsyncSession, locale: LocaleType, page: PageParams | None = None
+) -> Page[DocumentTranslation]:
     query = (
         select(DocumentTranslation)
         .options(
+            *index_content_options(DocumentTranslation),
             joinedload(DocumentTranslation.document).options(
                 selectinload(Document.authors),
-                selectinload(Document.translations),
+                selectinload(Document.translations).options(
+                    *defer_content_options(DocumentTranslation)
+                ),
             ),
             selectinload(DocumentTranslation.formats),
         )
         .join(Document)
         .filter(DocumentTranslation.locale == locale)
-        .order_by(Document.weight.desc(), DocumentTranslation.sort_title.asc())
     )
 
-    result = await db_session.scalars(query)
-    return result.all()
+    return await fetch_page(query, doc_keyset, page, db_session=db_session)
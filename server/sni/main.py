@@ -1,10 +1,13 @@
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 
 from sni.authors.router import router as authors_router
-from sni.content.update import update_content
+from sni.content.status import content_update_status
+from sni.content.update import update_content_in_background
 from sni.library.router import router as library_router
 from sni.mempool.router import router as mempool_router
 from sni.podcast.router import router as podcast_router
@@ -12,26 +15,41 @@ from sni.satoshi.router import router as satoshi_router
 from sni.skeptics.router import router as skeptics_router
 
 from .config import settings
-from .constants import STATIC_ROUTE
-from .middleware import APIKeyMiddleware
+from .constants import READY_ROUTE, STATIC_ROUTE
+from .middleware import APIKeyMiddleware, ContentReadyMiddleware
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    update_task = None
     if settings.ENVIRONMENT.is_debug:
-        update_content()
+        content_update_status.mark_pending()
+        update_task = asyncio.create_task(update_content_in_background())
     yield
+    if update_task is not None:
+        # The import runs in a worker thread that can't be interrupted, so let
+        # it finish and commit rather than exiting mid-transaction.
+        await update_task
 
 
 app = FastAPI(lifespan=lifespan)
 
+if not settings.CONTENT_UPDATE_SERVE_STALE:
+    app.add_middleware(ContentReadyMiddleware)
+
 if settings.API_KEY:
     app.add_middleware(APIKeyMiddleware)
 
-
 if settings.ENVIRONMENT.is_debug:
     app.mount(STATIC_ROUTE, StaticFiles(directory="static"), name="static")
 
+
+@app.get(READY_ROUTE, include_in_schema=False)
+async def ready():
+    status_code = 200 if content_update_status.is_ready else 503
+    return JSONResponse(content_update_status.to_dict(), status_code=status_code)
+
+
 app.include_router(authors_router, tags=["authors"], prefix="/authors")
 app.include_router(library_router, tags=["library"], prefix="/library")
 app.include_router(mempool_router, tags=["mempool"], prefix="/mempool")
@@ -1,10 +1,12 @@
-from typing import Sequence
+from typing import Iterator, Sequence
 
 from feedgen.feed import FeedGenerator
+from sqlalchemy import select
+from sqlalchemy.orm import Session, joinedload
 
-from sni.constants import LocaleType
-from sni.models import BlogPostTranslation
-from sni.shared.feed import FeedFormat
+from sni.constants import Locales, LocaleType
+from sni.models import BlogPost, BlogPostTranslation
+from sni.shared.feed import FeedFormat, render_feed
 from sni.shared.urls import BaseURLGenerator
 from sni.utils.dates import date_to_localized_datetime
 
@@ -57,9 +59,32 @@ def generate_mempool_feed(
         fe.link(href=urls.post(post.slug))
         fe.title(post.title)
         fe.published(date_to_localized_datetime(post.blog_post.added))
+        fe.updated(date_to_localized_datetime(post.blog_post.added))
         fe.dc.dc_creator(creator=[author.name for author in authors])
         fe.author([{"name": author.name} for author in authors])
         fe.description(post.excerpt)
         fe.content(post.html_content, type="CDATA")
 
     return fg
+
+
+def build_mempool_feeds(
+    db_session: Session,
+) -> Iterator[tuple[LocaleType, FeedFormat, bytes]]:
+    for locale in Locales:
+        query = (
+            select(BlogPostTranslation)
+            .options(
+                joinedload(BlogPostTranslation.blog_post).selectinload(BlogPost.authors)
+            )
+            .join(BlogPost)
+            .filter(BlogPostTranslation.locale == locale)
+            .order_by(BlogPost.added.desc())
+        )
+        posts = db_session.scalars(query).all()
+        if not posts:
+            continue
+
+        for format in FeedFormat:
+            feed = generate_mempool_feed(posts, locale.value, format)
+            yield locale.value, format, render_feed(feed, format)
@@ -7,7 +7,6 @@ from sni.models import (
     BlogSeriesTranslation,
     Translator,
 )
-from sni.shared.service import get
 
 from .schemas import (
     MempoolCanonicalMDModel,
@@ -28,17 +27,17 @@ class MempoolImporter(TranslatedMarkdownImporter):
     md_schema = MempoolMDModel
     translation_schema = MempoolTranslationMDModel
     content_key = "blog_post"
+    inputs = (Author, Translator, BlogSeries, BlogSeriesTranslation)
+    outputs = (BlogPost, BlogPostTranslation)
 
     def process_canonical_additional_data(self, canonical_data):
         canonical_data["authors"] = [
-            get(Author, db_session=self.db_session, slug=author)
+            self.lookups.get(Author, slug=author)
             for author in canonical_data.pop("authors")
         ]
         series = canonical_data.pop("series")
         canonical_data["series"] = (
-            get(
-                BlogSeriesTranslation, db_session=self.db_session, slug=series
-            ).blog_series
+            self.lookups.get(BlogSeriesTranslation, slug=series).blog_series
             if series
             else None
         )
@@ -48,7 +47,7 @@ class MempoolImporter(TranslatedMarkdownImporter):
         self, translation_data, canonical_entry, metadata
     ):
         translation_data["translators"] = [
-            get(Translator, db_session=self.db_session, slug=slug)
+            self.lookups.get(Translator, slug=slug)
             for slug in translation_data.pop("translators", [])
         ]
         return super().process_translation_additional_data(
@@ -62,7 +61,7 @@ class MempoolImporter(TranslatedMarkdownImporter):
             translation_data.get("excerpt") or canonical_entry["translation"].excerpt
         )
         translation_data["translators"] = [
-            get(Translator, db_session=self.db_session, slug=slug)
+            self.lookups.get(Translator, slug=slug)
             for slug in translation_data.pop("translators", [])
         ]
 
@@ -85,6 +84,7 @@ class MempoolSeriesImporter(TranslatedMarkdownImporter):
     md_schema = MempoolSeriesMDModel
     translation_schema = MempoolSeriesTranslationMDModel
     content_key = "blog_series"
+    outputs = (BlogSeries, BlogSeriesTranslation)
 
 
 def import_mempool_series():
@@ -1,12 +1,20 @@
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from sni.constants import LocaleType
 from sni.database import get_db
-from sni.shared.feed import FeedFormat
-from sni.shared.responses import AtomResponse, RSSResponse
+from sni.shared.cache import CachedRoute
+from sni.shared.feed import (
+    FeedFormat,
+    feed_response,
+    get_feed,
+    render_feed,
+    stored_feed_response,
+)
+from sni.shared.pagination import PageParams, page_response
+from sni.shared.projection import FieldsParams, project_fields
 from sni.shared.schemas import SlugParamModel
 
 from . import service
@@ -18,7 +26,7 @@ from .schemas import (
     MempoolSeriesModel,
 )
 
-series_router = APIRouter()
+series_router = APIRouter(route_class=CachedRoute)
 
 
 @series_router.get("", response_model=list[MempoolSeriesModel])
@@ -48,15 +56,24 @@ async def get_mempool_series(
     return {"series": series, "posts": posts}
 
 
-router = APIRouter()
+router = APIRouter(route_class=CachedRoute)
 router.include_router(series_router, prefix="/series")
 
 
 @router.get("", response_model=list[MempoolPostIndexModel])
 async def get_mempool_posts(
-    locale: LocaleType = "en", db: AsyncSession = Depends(get_db)
+    request: Request,
+    response: Response,
+    locale: LocaleType = "en",
+    page: PageParams = Depends(),
+    fields: FieldsParams = Depends(),
+    db: AsyncSession = Depends(get_db),
 ) -> Any:
-    return await service.get_all_posts_by_locale(db_session=db, locale=locale)
+    posts = await service.get_all_posts_by_locale(
+        db_session=db, locale=locale, page=page
+    )
+    items = page_response(posts, request, response)
+    return project_fields(items, MempoolPostIndexModel, fields, response)
 
 
 @router.get("/latest", response_model=MempoolPostIndexModel)
@@ -81,13 +98,14 @@ async def generate_feed(
     format: FeedFormat = FeedFormat.rss,
     db: AsyncSession = Depends(get_db),
 ) -> Any:
-    posts = await service.get_all_posts_by_locale(db_session=db, locale=locale)
+    stored_feed = await get_feed("mempool", locale, format, db_session=db)
+    if stored_feed:
+        return stored_feed_response(stored_feed)
+
+    posts = await service.get_feed_posts(db_session=db, locale=locale)
     feed = generate_mempool_feed(posts, locale, format)
 
-    if format == FeedFormat.rss:
-        return RSSResponse(content=feed.rss_str(pretty=True))
-    else:
-        return AtomResponse(content=feed.atom_str(pretty=True))
+    return feed_response(render_feed(feed, format), format)
 
 
 @router.get("/{slug}", response_model=MempoolPostModel)
@@ -113,7 +113,10 @@ class MempoolPostIndexModel(MempoolPostBaseModel):
     @model_validator(mode="before")
     @classmethod
     def check_content(cls, data: Any) -> Any:
-        data.has_content = bool(data.html_content)
+        if data.has_html_content is None:
+            data.has_content = bool(data.html_content)
+        else:
+            data.has_content = bool(data.has_html_content)
         return data
 
 
@@ -6,6 +6,8 @@ from sqlalchemy.orm import joinedload, selectinload
 
 from sni.constants import LocaleType
 from sni.models import BlogPost, BlogPostTranslation, BlogSeries, BlogSeriesTranslation
+from sni.shared.pagination import Keyset, KeysetColumn, Page, PageParams, fetch_page
+from sni.shared.service import defer_content_options, index_content_options
 
 
 async def get_post(
@@ -35,20 +37,53 @@ async def get_params(*, db_session: AsyncSession) -> list[dict[str, LocaleType]]
     return [dict(slug=slug, locale=locale) for (slug, locale) in all_params]
 
 
+def post_index_options() -> list:
+    return [
+        *index_content_options(BlogPostTranslation),
+        joinedload(BlogPostTranslation.blog_post).options(
+            selectinload(BlogPost.authors),
+            selectinload(BlogPost.translations).options(
+                *defer_content_options(BlogPostTranslation)
+            ),
+            joinedload(BlogPost.series)
+            .selectinload(BlogSeries.translations)
+            .options(*defer_content_options(BlogSeriesTranslation)),
+        ),
+    ]
+
+
+post_keyset = Keyset(
+    KeysetColumn(BlogPost.added, lambda post: post.blog_post.added, descending=True),
+    KeysetColumn(BlogPostTranslation.id, lambda post: post.id, descending=True),
+)
+
+
 async def get_all_posts_by_locale(
+    *,
+    db_session: AsyncSession,
+    locale: LocaleType = "en",
+    page: PageParams | None = None,
+) -> Page[BlogPostTranslation]:
+    query = (
+        select(BlogPostTranslation)
+        .options(*post_index_options())
+        .join(BlogPost)
+        .outerjoin(BlogSeries)
+        .filter(BlogPostTranslation.locale == locale)
+    )
+
+    return await fetch_page(query, post_keyset, page, db_session=db_session)
+
+
+async def get_feed_posts(
     *, db_session: AsyncSession, locale: LocaleType = "en"
 ) -> Sequence[BlogPostTranslation]:
     query = (
         select(BlogPostTranslation)
         .options(
-            joinedload(BlogPostTranslation.blog_post).options(
-                selectinload(BlogPost.authors),
-                selectinload(BlogPost.translations),
-                joinedload(BlogPost.series).selectinload(BlogSeries.translations),
-            )
+            joinedload(BlogPostTranslation.blog_post).selectinload(BlogPost.authors)
         )
         .join(BlogPost)
-        .outerjoin(BlogSeries)
         .filter(BlogPostTranslation.locale == locale)
         .order_by(BlogPost.added.desc())
     )
@@ -62,13 +97,7 @@ async def get_latest_post(
 ) -> BlogPostTranslation | None:
     query = (
         select(BlogPostTranslation)
-        .options(
-            joinedload(BlogPostTranslation.blog_post).options(
-                selectinload(BlogPost.authors),
-                selectinload(BlogPost.translations),
-                joinedload(BlogPost.series).selectinload(BlogSeries.translations),
-            )
-        )
+        .options(*post_index_options())
         .filter_by(locale=locale)
         .join(BlogPost)
         .order_by(BlogPost.added.desc())
@@ -102,11 +131,14 @@ async def get_series_posts(
     query = (
         select(BlogPostTranslation)
         .options(
+            *index_content_options(BlogPostTranslation),
             joinedload(BlogPostTranslation.blog_post).options(
                 joinedload(BlogPost.series),
                 selectinload(BlogPost.authors),
-                selectinload(BlogPost.translations),
-            )
+                selectinload(BlogPost.translations).options(
+                    *defer_content_options(BlogPostTranslation)
+                ),
+            ),
         )
         .join(BlogPost)
         .filter(
@@ -3,13 +3,16 @@ from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 
 from .config import settings
-from .constants import STATIC_ROUTE
+from .constants import READY_ROUTE, STATIC_ROUTE
+from .content.status import content_update_status
 
 
 class APIKeyMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next):
         if settings.ENVIRONMENT.is_debug and request.url.path.startswith(STATIC_ROUTE):
             return await call_next(request)
+        if request.url.path == READY_ROUTE:
+            return await call_next(request)
 
         api_key = request.headers.get("X-API-Key") or request.query_params.get(
             "api_key"
@@ -20,3 +23,23 @@ class APIKeyMiddleware(BaseHTTPMiddleware):
             )
 
         return await call_next(request)
+
+
+class ContentReadyMiddleware(BaseHTTPMiddleware):
+    """
+    Reject API requests while the startup content update is in progress,
+    rather than serving content from before the update.
+    """
+
+    async def dispatch(self, request: Request, call_next):
+        if request.url.path == READY_ROUTE or request.url.path.startswith(STATIC_ROUTE):
+            return await call_next(request)
+
+        if content_update_status.state.in_progress:
+            return JSONResponse(
+                {"detail": "Content update in progress"},
+                status_code=503,
+                headers={"Retry-After": "5"},
+            )
+
+        return await call_next(request)
@@ -1,5 +1,6 @@
 from .authors import Author  # noqa: F401
 from .content import FileMetadata, JSONFile, MarkdownContent, YAMLFile  # noqa: F401
+from .feeds import Feed  # noqa: F401
 from .library import (  # noqa: F401
     Document,
     DocumentFormat,
@@ -1,7 +1,14 @@
 import datetime
+import os
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, Text
-from sqlalchemy.orm import Mapped, backref, mapped_column, relationship
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy.orm import (
+    Mapped,
+    backref,
+    mapped_column,
+    query_expression,
+    relationship,
+)
 
 from sni.database import Base
 
@@ -20,6 +27,8 @@ class MarkdownContent(Base):
         ),
     )
     content_type: Mapped[str] = mapped_column(String(50))
+    # Set by queries that defer html_content but still need to know if it's empty
+    has_html_content: Mapped[bool | None] = query_expression()
 
     __mapper_args__ = {
         "polymorphic_identity": "markdown_content",
@@ -66,3 +75,13 @@ class FileMetadata(Base):
     filename: Mapped[str] = mapped_column(String, nullable=False)
     hash: Mapped[str] = mapped_column(String, nullable=False)
     last_modified: Mapped[datetime.datetime] = mapped_column(DateTime, nullable=False)
+    mtime_ns: Mapped[int] = mapped_column(BigInteger, nullable=True)
+    size: Mapped[int] = mapped_column(BigInteger, nullable=True)
+
+    def matches_stat(self, stat: os.stat_result) -> bool:
+        """Whether the file looks unchanged since its hash was recorded."""
+        return self.mtime_ns == stat.st_mtime_ns and self.size == stat.st_size
+
+    def update_stat(self, stat: os.stat_result) -> None:
+        self.mtime_ns = stat.st_mtime_ns
+        self.size = stat.st_size
@@ -7,6 +7,7 @@ from sqlalchemy import (
     Date,
     Enum,
     ForeignKey,
+    Index,
     Integer,
     String,
     Table,
@@ -126,7 +127,10 @@ class DocumentTranslation(MarkdownContent):
 
     __mapper_args__ = {"polymorphic_identity": "document"}
 
-    __table_args__ = (UniqueConstraint("document_id", "locale"),)
+    __table_args__ = (
+        UniqueConstraint("document_id", "locale"),
+        Index("ix_document_translations_locale_slug", "locale", "slug"),
+    )
 
     @property
     def serialized_formats(self) -> list[str]:
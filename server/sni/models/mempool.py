@@ -7,6 +7,7 @@ from sqlalchemy import (
     Date,
     Enum,
     ForeignKey,
+    Index,
     Integer,
     String,
     Table,
@@ -101,7 +102,10 @@ class BlogPostTranslation(MarkdownContent):
 
     __mapper_args__ = {"polymorphic_identity": "blog_post"}
 
-    __table_args__ = (UniqueConstraint("blog_post_id", "locale"),)
+    __table_args__ = (
+        UniqueConstraint("blog_post_id", "locale"),
+        Index("ix_blog_post_translations_locale_slug", "locale", "slug"),
+    )
 
     @property
     def translations(self):
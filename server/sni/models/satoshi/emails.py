@@ -28,7 +28,7 @@ class EmailThread(Base):
     title: Mapped[str] = mapped_column(String, nullable=False)
     date: Mapped[datetime.datetime] = mapped_column(DateTime, nullable=False)
     url: Mapped[str] = mapped_column(String, nullable=False)
-    source: Mapped[str] = mapped_column(String, nullable=False)
+    source: Mapped[str] = mapped_column(String, index=True, nullable=False)
     emails: Mapped[List["Email"]] = relationship(back_populates="thread")
     file_id: Mapped[int] = mapped_column(Integer, ForeignKey("json_files.id"))
     file: Mapped[EmailThreadFile] = relationship(
@@ -59,7 +59,7 @@ class Email(Base):
     text: Mapped[str] = mapped_column(Text, nullable=False)
     source_id: Mapped[str] = mapped_column(String, nullable=False)
     parent_id: Mapped[int] = mapped_column(
-        Integer, ForeignKey("emails.id"), nullable=True
+        Integer, ForeignKey("emails.id"), index=True, nullable=True
     )
     parent: Mapped["Email"] = relationship(
         "Email",
@@ -70,7 +70,9 @@ class Email(Base):
     replies: Mapped[List["Email"]] = relationship(
         "Email", back_populates="parent", join_depth=1
     )
-    thread_id = mapped_column(Integer, ForeignKey("email_threads.id"), nullable=False)
+    thread_id = mapped_column(
+        Integer, ForeignKey("email_threads.id"), index=True, nullable=False
+    )
     thread: Mapped[EmailThread] = relationship(back_populates="emails")
     quotes: Mapped[List["Quote"]] = relationship(back_populates="email")
     file_id: Mapped[int] = mapped_column(Integer, ForeignKey("json_files.id"))
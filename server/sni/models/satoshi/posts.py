@@ -28,7 +28,7 @@ class ForumThread(Base):
     title: Mapped[str] = mapped_column(String, nullable=False)
     date: Mapped[datetime.datetime] = mapped_column(DateTime, nullable=False)
     url: Mapped[str] = mapped_column(String, nullable=False)
-    source: Mapped[str] = mapped_column(String, nullable=False)
+    source: Mapped[str] = mapped_column(String, index=True, nullable=False)
     posts: Mapped[List["ForumPost"]] = relationship(back_populates="thread")
     file_id: Mapped[int] = mapped_column(Integer, ForeignKey("json_files.id"))
     file: Mapped[ForumThreadFile] = relationship(
@@ -65,7 +65,7 @@ class ForumPost(Base):
     )
     source_id: Mapped[str] = mapped_column(String, nullable=False)
     thread_id: Mapped[int] = mapped_column(
-        Integer, ForeignKey("forum_threads.id"), nullable=False
+        Integer, ForeignKey("forum_threads.id"), index=True, nullable=False
     )
     thread: Mapped[ForumThread] = relationship(back_populates="posts")
     quotes: Mapped[List["Quote"]] = relationship(back_populates="post")
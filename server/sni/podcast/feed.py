@@ -1,8 +1,12 @@
-from typing import Sequence
+from typing import Iterator, Sequence
 
 from feedgen.feed import FeedGenerator
+from sqlalchemy import select
+from sqlalchemy.orm import Session
 
+from sni.constants import LocaleType
 from sni.models import Episode
+from sni.shared.feed import FeedFormat, render_feed
 from sni.shared.urls import BaseURLGenerator
 from sni.utils.dates import localize_time
 
@@ -52,6 +56,9 @@ def generate_podcast_feed(
     fg.image(urls.image("cmpodcast_144.jpg"))
     fg.podcast.itunes_image(urls.image("cmpodcast_1440.jpg"))
     fg.podcast.itunes_category("Technology", "Tech News")
+    if episodes:
+        # Date the feed by its content so that rebuilding it is deterministic
+        fg.updated(localize_time(episodes[0].date))
 
     for episode in reversed(episodes):
         description = f"""{episode.notes}
@@ -71,3 +78,18 @@ def generate_podcast_feed(
         fe.pubDate(localize_time(episode.date))
 
     return fg
+
+
+def build_podcast_feeds(
+    db_session: Session,
+) -> Iterator[tuple[LocaleType, FeedFormat, bytes]]:
+    # Reload episodes imported in this session, whose dates are still the
+    # timezone-aware values parsed from front matter rather than stored ones
+    query = (
+        select(Episode)
+        .order_by(Episode.date.desc())
+        .execution_options(populate_existing=True)
+    )
+    episodes = db_session.scalars(query).all()
+    feed = generate_podcast_feed(episodes)
+    yield "en", FeedFormat.rss, render_feed(feed, FeedFormat.rss)
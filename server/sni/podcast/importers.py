@@ -8,6 +8,7 @@ class EpisodeImporter(MarkdownImporter):
     directory_path = "content/podcast"
     content_type = "Episode"
     model = Episode
+    outputs = (Episode,)
     schema = EpisodeMDModel
     content_key = "episode"
 
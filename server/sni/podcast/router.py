@@ -4,13 +4,15 @@ from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from sni.database import get_db
+from sni.shared.cache import CachedRoute
+from sni.shared.feed import FeedFormat, get_feed, stored_feed_response
 from sni.shared.responses import RSSResponse
 
 from .feed import generate_podcast_feed
 from .schemas import EpisodeModel
 from .service import get, get_all
 
-router = APIRouter()
+router = APIRouter(route_class=CachedRoute)
 
 
 @router.get("", response_model=list[EpisodeModel])
@@ -20,6 +22,10 @@ async def get_episodes(db: AsyncSession = Depends(get_db)) -> Any:
 
 @router.get("/feed", response_class=Response)
 async def generate_feed(db: AsyncSession = Depends(get_db)) -> Response:
+    stored_feed = await get_feed("podcast", "en", FeedFormat.rss, db_session=db)
+    if stored_feed:
+        return stored_feed_response(stored_feed)
+
     episodes = await get_all(db_session=db)
     feed = generate_podcast_feed(episodes)
 
@@ -11,6 +11,11 @@ class EmailImporter(JSONImporter):
     model = Email
     file_model = EmailFile
     content_type = "emails"
+    natural_key = ("source_id",)
+    streaming = True
+    dependent_importers = [QuoteImporter]
+    inputs = (EmailThread,)
+    outputs = (Email,)
 
 
 class EmailThreadImporter(JSONImporter):
@@ -19,4 +24,6 @@ class EmailThreadImporter(JSONImporter):
     model = EmailThread
     file_model = EmailThreadFile
     content_type = "email_threads"
+    natural_key = ("id",)
     dependent_importers = [QuoteImporter, EmailImporter]
+    outputs = (EmailThread,)
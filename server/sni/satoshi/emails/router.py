@@ -1,9 +1,12 @@
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from sni.database import get_db
+from sni.shared.cache import CachedRoute
+from sni.shared.pagination import PageParams, page_response
+from sni.shared.projection import FieldsParams, project_fields
 
 from . import service
 from .schemas import (
@@ -15,12 +18,20 @@ from .schemas import (
     SatoshiEmailModel,
 )
 
-router = APIRouter()
+router = APIRouter(route_class=CachedRoute)
 
 
 @router.get("", response_model=List[EmailBaseModel])
-async def get_emails(db: AsyncSession = Depends(get_db)):
-    return await service.get_all_emails(db_session=db)
+async def get_emails(
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(),
+    fields: FieldsParams = Depends(),
+    db: AsyncSession = Depends(get_db),
+):
+    emails = await service.get_all_emails(db_session=db, page=page)
+    items = page_response(emails, request, response)
+    return project_fields(items, EmailBaseModel, fields, response)
 
 
 @router.get("/threads", response_model=List[EmailThreadBaseModel])
@@ -50,14 +61,13 @@ async def get_email_thread_by_source(
     satoshi: bool = False,
     db: AsyncSession = Depends(get_db),
 ):
-    thread = await service.get_thread(thread_id, db_session=db)
-    if not thread or thread.source != source:
+    thread, previous_thread, next_thread = await service.get_thread_with_neighbors(
+        source, thread_id, db_session=db
+    )
+    if not thread:
         raise HTTPException(status_code=404, detail="Email thread not found")
 
-    emails = await service.get_thread_emails(source, thread_id, satoshi, db_session=db)
-
-    previous_thread = await service.get_thread(thread_id - 1, db_session=db)
-    next_thread = await service.get_thread(thread_id + 1, db_session=db)
+    emails = await service.get_thread_email_tree(thread, satoshi, db_session=db)
 
     return {
         "thread": thread,
@@ -73,11 +83,10 @@ async def get_email_by_source(
     satoshi_id: int,
     db: AsyncSession = Depends(get_db),
 ):
-    email = await service.get_satoshi_email_by_source(source, satoshi_id, db_session=db)
+    email, previous_email, next_email = await service.get_satoshi_email_with_neighbors(
+        source, satoshi_id, db_session=db
+    )
     if not email:
         raise HTTPException(status_code=404, detail="Email not found")
 
-    previous_email = await service.get_email(satoshi_id - 1, db_session=db)
-    next_email = await service.get_email(satoshi_id + 1, db_session=db)
-
     return {"email": email, "previous": previous_email, "next": next_email}
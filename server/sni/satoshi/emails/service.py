@@ -1,24 +1,42 @@
+from collections import defaultdict
 from typing import Sequence
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy.orm import joinedload, load_only, raiseload, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
 from sni.models import Email, EmailThread
+from sni.shared.pagination import Keyset, KeysetColumn, Page, PageParams, fetch_page
+from sni.shared.service import get_with_neighbors
 
-from .schemas import EmailSource
+email_keyset = Keyset(
+    KeysetColumn(Email.date, lambda email: email.date),
+    KeysetColumn(Email.id, lambda email: email.id),
+)
 
 
-async def get_all_emails(*, db_session: AsyncSession) -> Sequence[Email]:
+def email_list_options() -> list:
+    # Replies are only listed by source_id, and the parent isn't listed at all
+    return [
+        joinedload(Email.thread),
+        raiseload(Email.parent),
+        selectinload(Email.replies).options(
+            load_only(Email.source_id), raiseload(Email.parent)
+        ),
+    ]
+
+
+async def get_all_emails(
+    *, db_session: AsyncSession, page: PageParams | None = None
+) -> Page[Email]:
     query = (
         select(Email)
-        .options(joinedload(Email.thread), selectinload(Email.replies))
+        .options(*email_list_options())
         .filter(Email.satoshi_id.isnot(None))
-        .order_by(Email.date)
     )
 
-    result = await db_session.scalars(query)
-    return result.all()
+    return await fetch_page(query, email_keyset, page, db_session=db_session)
 
 
 async def get_threads(*, db_session: AsyncSession) -> Sequence[EmailThread]:
@@ -33,7 +51,7 @@ async def get_satoshi_emails_by_source(
 ) -> Sequence[Email]:
     query = (
         select(Email)
-        .options(joinedload(Email.thread), selectinload(Email.replies))
+        .options(*email_list_options())
         .filter(Email.satoshi_id.isnot(None))
         .join(EmailThread)
         .filter_by(source=source)
@@ -44,29 +62,29 @@ async def get_satoshi_emails_by_source(
     return result.all()
 
 
-async def get_satoshi_email_by_source(
+async def get_satoshi_email_with_neighbors(
     source: str, satoshi_id: int, *, db_session: AsyncSession
-) -> Email | None:
-    query = (
+) -> tuple[Email | None, Email | None, Email | None]:
+    """
+    Fetch one of Satoshi's emails from a source along with his previous and
+    next emails from that source.
+    """
+    query = select(Email).options(joinedload(Email.thread), selectinload(Email.replies))
+    sequence = (
         select(Email)
-        .options(joinedload(Email.thread), selectinload(Email.replies))
-        .filter_by(satoshi_id=satoshi_id)
         .join(EmailThread)
-        .filter_by(source=source)
+        .filter(Email.satoshi_id.isnot(None), EmailThread.source == source)
     )
 
-    return await db_session.scalar(query)
-
-
-async def get_email(satoshi_id: int, *, db_session: AsyncSession) -> Email | None:
-    query = (
-        select(Email)
-        .options(selectinload(Email.replies), joinedload(Email.thread))
-        .filter_by(satoshi_id=satoshi_id)
+    return await get_with_neighbors(
+        query,
+        sequence,
+        Email.id,
+        Email.satoshi_id,
+        Email.satoshi_id == satoshi_id,
+        db_session=db_session,
     )
 
-    return await db_session.scalar(query)
-
 
 async def get_threads_by_source(
     source: str, *, db_session: AsyncSession
@@ -88,25 +106,78 @@ async def get_thread(thread_id: int, *, db_session: AsyncSession) -> EmailThread
     return await db_session.scalar(query)
 
 
-async def get_thread_emails(
-    source: EmailSource,
-    thread_id: int,
-    satoshi: bool = False,
-    *,
-    db_session: AsyncSession,
+async def get_thread_with_neighbors(
+    source: str, thread_id: int, *, db_session: AsyncSession
+) -> tuple[EmailThread | None, EmailThread | None, EmailThread | None]:
+    """Fetch a thread along with the previous and next threads from its source."""
+    return await get_with_neighbors(
+        select(EmailThread),
+        select(EmailThread).filter_by(source=source),
+        EmailThread.id,
+        EmailThread.id,
+        EmailThread.id == thread_id,
+        db_session=db_session,
+    )
+
+
+async def get_thread_email_tree(
+    thread: EmailThread, satoshi: bool = False, *, db_session: AsyncSession
 ) -> Sequence[Email]:
+    """
+    Fetch every email in a thread with one flat query, and link up each
+    email's thread, parent and replies in memory.
+    """
     query = (
         select(Email)
-        .options(
-            joinedload(Email.parent).selectinload(Email.replies),
-            selectinload(Email.replies),
-        )
-        .join(EmailThread)
-        .filter(Email.thread_id == thread_id, EmailThread.source == source)
+        .options(raiseload("*"))
+        .filter(Email.thread_id == thread.id)
+        .order_by(Email.date)
     )
-    if satoshi:
-        query = query.filter(Email.satoshi_id.is_not(None))
-    query = query.order_by(Email.date)
+    result = await db_session.scalars(query)
+    emails = result.all()
 
+    emails_by_id = {email.id: email for email in emails}
+    replies = defaultdict(list)
+    for email in emails:
+        if email.parent_id is not None:
+            replies[email.parent_id].append(email)
+
+    # Replies from other threads, which are only listed by source_id
+    query = (
+        select(Email)
+        .options(load_only(Email.source_id, Email.parent_id), raiseload("*"))
+        .filter(Email.parent_id.in_(list(emails_by_id)), Email.thread_id != thread.id)
+    )
     result = await db_session.scalars(query)
-    return result.all()
+    for reply in result.all():
+        replies[reply.parent_id].append(reply)
+
+    # Replies to an email in another thread, which needs loading on its own
+    outside_parent_ids = {
+        email.parent_id
+        for email in emails
+        if email.parent_id is not None and email.parent_id not in emails_by_id
+    }
+    if outside_parent_ids:
+        query = (
+            select(Email)
+            .options(
+                joinedload(Email.thread),
+                raiseload(Email.parent),
+                selectinload(Email.replies).options(
+                    load_only(Email.source_id), raiseload(Email.parent)
+                ),
+            )
+            .filter(Email.id.in_(outside_parent_ids))
+        )
+        result = await db_session.scalars(query)
+        emails_by_id.update((parent.id, parent) for parent in result.all())
+
+    for email in emails:
+        set_committed_value(email, "thread", thread)
+        set_committed_value(email, "replies", replies[email.id])
+        set_committed_value(email, "parent", emails_by_id.get(email.parent_id))
+
+    if satoshi:
+        return [email for email in emails if email.satoshi_id is not None]
+    return emails
@@ -17,6 +17,11 @@ class ForumPostImporter(JSONImporter):
     model = ForumPost
     file_model = ForumPostFile
     content_type = "forum_posts"
+    natural_key = ("source_id",)
+    streaming = True
+    dependent_importers = [QuoteImporter]
+    inputs = (ForumThread,)
+    outputs = (ForumPost,)
 
     def process_item_data(self, item_data):
         item_data["text"] = MDRender.process_html(item_data["text"])
@@ -29,4 +34,6 @@ class ForumThreadImporter(JSONImporter):
     model = ForumThread
     file_model = ForumThreadFile
     content_type = "forum_threads"
+    natural_key = ("id",)
     dependent_importers = [QuoteImporter, ForumPostImporter]
+    outputs = (ForumThread,)
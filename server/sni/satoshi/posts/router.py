@@ -1,9 +1,12 @@
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from sni.database import get_db
+from sni.shared.cache import CachedRoute
+from sni.shared.pagination import PageParams, page_response
+from sni.shared.projection import FieldsParams, project_fields
 
 from . import service
 from .schemas import (
@@ -15,12 +18,20 @@ from .schemas import (
     ForumThreadModel,
 )
 
-router = APIRouter()
+router = APIRouter(route_class=CachedRoute)
 
 
 @router.get("", response_model=list[ForumPostBaseModel])
-async def get_forum_posts(db: AsyncSession = Depends(get_db)) -> Any:
-    return await service.get_all_posts(db_session=db)
+async def get_forum_posts(
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(),
+    fields: FieldsParams = Depends(),
+    db: AsyncSession = Depends(get_db),
+) -> Any:
+    posts = await service.get_all_posts(db_session=db, page=page)
+    items = page_response(posts, request, response)
+    return project_fields(items, ForumPostBaseModel, fields, response)
 
 
 @router.get("/threads", response_model=list[ForumThreadBaseModel])
@@ -49,14 +60,13 @@ async def get_forum_thread_by_source(
     satoshi: bool = False,
     db: AsyncSession = Depends(get_db),
 ) -> Any:
-    thread = await service.get_thread(thread_id, db_session=db)
-    if not thread or thread.source != source:
+    thread, previous_thread, next_thread = await service.get_thread_with_neighbors(
+        source, thread_id, db_session=db
+    )
+    if not thread:
         raise HTTPException(status_code=404, detail="Forum thread not found")
 
-    posts = await service.get_thread_posts(source, thread_id, satoshi, db_session=db)
-
-    previous_thread = await service.get_thread(thread_id - 1, db_session=db)
-    next_thread = await service.get_thread(thread_id + 1, db_session=db)
+    posts = await service.get_thread_post_list(thread, satoshi, db_session=db)
 
     return {
         "thread": thread,
@@ -70,11 +80,10 @@ async def get_forum_thread_by_source(
 async def get_forum_post_by_source(
     source: ForumPostSource, satoshi_id: int, db: AsyncSession = Depends(get_db)
 ) -> Any:
-    post = await service.get_post_by_source(source, satoshi_id, db_session=db)
+    post, previous_post, next_post = await service.get_post_with_neighbors(
+        source, satoshi_id, db_session=db
+    )
     if not post:
         raise HTTPException(status_code=404, detail="Forum post not found")
 
-    previous_post = await service.get_post(satoshi_id - 1, db_session=db)
-    next_post = await service.get_post(satoshi_id + 1, db_session=db)
-
     return {"post": post, "previous": previous_post, "next": next_post}
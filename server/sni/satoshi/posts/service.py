@@ -2,23 +2,29 @@ from typing import Sequence
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy.orm import joinedload, raiseload, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
 from sni.models import ForumPost, ForumThread
+from sni.shared.pagination import Keyset, KeysetColumn, Page, PageParams, fetch_page
+from sni.shared.service import get_with_neighbors
 
-from .schemas import ForumPostSource
+post_keyset = Keyset(
+    KeysetColumn(ForumPost.date, lambda post: post.date),
+    KeysetColumn(ForumPost.id, lambda post: post.id),
+)
 
 
-async def get_all_posts(*, db_session: AsyncSession) -> Sequence[ForumPost]:
+async def get_all_posts(
+    *, db_session: AsyncSession, page: PageParams | None = None
+) -> Page[ForumPost]:
     query = (
         select(ForumPost)
         .options(joinedload(ForumPost.thread))
         .filter(ForumPost.satoshi_id.isnot(None))
-        .order_by(ForumPost.date)
     )
 
-    result = await db_session.scalars(query)
-    return result.all()
+    return await fetch_page(query, post_keyset, page, db_session=db_session)
 
 
 async def get_threads(*, db_session: AsyncSession) -> Sequence[ForumThread]:
@@ -44,29 +50,29 @@ async def get_posts_by_source(
     return result.all()
 
 
-async def get_post_by_source(
+async def get_post_with_neighbors(
     source: str, satoshi_id: int, *, db_session: AsyncSession
-) -> ForumPost | None:
-    query = (
+) -> tuple[ForumPost | None, ForumPost | None, ForumPost | None]:
+    """
+    Fetch one of Satoshi's forum posts from a source along with his previous
+    and next posts from that source.
+    """
+    query = select(ForumPost).options(joinedload(ForumPost.thread))
+    sequence = (
         select(ForumPost)
-        .options(joinedload(ForumPost.thread))
-        .filter_by(satoshi_id=satoshi_id)
         .join(ForumThread)
-        .filter_by(source=source)
+        .filter(ForumPost.satoshi_id.isnot(None), ForumThread.source == source)
     )
 
-    return await db_session.scalar(query)
-
-
-async def get_post(satoshi_id: int, *, db_session: AsyncSession) -> ForumPost | None:
-    query = (
-        select(ForumPost)
-        .options(joinedload(ForumPost.thread))
-        .filter_by(satoshi_id=satoshi_id)
+    return await get_with_neighbors(
+        query,
+        sequence,
+        ForumPost.id,
+        ForumPost.satoshi_id,
+        ForumPost.satoshi_id == satoshi_id,
+        db_session=db_session,
     )
 
-    return await db_session.scalar(query)
-
 
 async def get_threads_by_source(
     source: str, *, db_session: AsyncSession
@@ -88,17 +94,35 @@ async def get_thread(thread_id: int, *, db_session: AsyncSession) -> ForumThread
     return await db_session.scalar(query)
 
 
-async def get_thread_posts(
-    source: ForumPostSource, thread_id: int, satoshi: bool, *, db_session: AsyncSession
+async def get_thread_with_neighbors(
+    source: str, thread_id: int, *, db_session: AsyncSession
+) -> tuple[ForumThread | None, ForumThread | None, ForumThread | None]:
+    """Fetch a thread along with the previous and next threads from its source."""
+    return await get_with_neighbors(
+        select(ForumThread),
+        select(ForumThread).filter_by(source=source),
+        ForumThread.id,
+        ForumThread.id,
+        ForumThread.id == thread_id,
+        db_session=db_session,
+    )
+
+
+async def get_thread_post_list(
+    thread: ForumThread, satoshi: bool = False, *, db_session: AsyncSession
 ) -> Sequence[ForumPost]:
+    """Fetch every post in a thread, linking each to the already loaded thread."""
     query = (
         select(ForumPost)
-        .join(ForumThread)
-        .filter(ForumPost.thread_id == thread_id, ForumThread.source == source)
+        .options(raiseload("*"))
+        .filter(ForumPost.thread_id == thread.id)
     )
     if satoshi:
         query = query.filter(ForumPost.satoshi_id.isnot(None))
     query = query.order_by(ForumPost.date)
 
     result = await db_session.scalars(query)
-    return result.all()
+    posts = result.all()
+    for post in posts:
+        set_committed_value(post, "thread", thread)
+    return posts
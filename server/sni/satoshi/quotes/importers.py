@@ -1,6 +1,14 @@
+from sqlalchemy.orm import selectinload
+
 from sni.content.json import JSONImporter
-from sni.models import Quote, QuoteCategory, QuoteCategoryFile, QuoteFile
-from sni.shared.service import get
+from sni.models import (
+    Email,
+    ForumPost,
+    Quote,
+    QuoteCategory,
+    QuoteCategoryFile,
+    QuoteFile,
+)
 
 from .schemas import QuoteCategoryJSONModel, QuoteJSONModel
 
@@ -11,10 +19,15 @@ class QuoteImporter(JSONImporter):
     model = Quote
     file_model = QuoteFile
     content_type = "quotes"
+    bulk_insert = False
+    natural_key = ("text", "date")
+    sync_load_options = (selectinload(Quote.categories),)
+    inputs = (Email, ForumPost, QuoteCategory)
+    outputs = (Quote,)
 
     def process_item_data(self, quote_data):
         quote_data["categories"] = [
-            get(QuoteCategory, db_session=self.db_session, slug=category)
+            self.lookups.get(QuoteCategory, slug=category)
             for category in quote_data.pop("categories", [])
         ]
         return quote_data
@@ -26,4 +39,6 @@ class QuoteCategoryImporter(JSONImporter):
     model = QuoteCategory
     file_model = QuoteCategoryFile
     content_type = "quote_categories"
+    natural_key = ("slug",)
     dependent_importers = [QuoteImporter]
+    outputs = (QuoteCategory,)
@@ -4,11 +4,12 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from sni.database import get_db
+from sni.shared.cache import CachedRoute
 
 from . import service
 from .schemas import QuoteCategoryBaseModel, QuoteCategoryModel
 
-router = APIRouter()
+router = APIRouter(route_class=CachedRoute)
 
 
 @router.get("", response_model=List[QuoteCategoryBaseModel])
@@ -0,0 +1,201 @@
+import datetime
+import time
+from collections import OrderedDict
+from typing import Callable, Coroutine, NamedTuple
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+
+from sni.config import settings
+from sni.database import SessionLocal
+
+from .conditional import (
+    format_http_date,
+    is_not_modified,
+    make_etag,
+    not_modified_response,
+)
+from .service import get_content_last_modified
+
+
+class ContentVersion:
+    """
+    Counter bumped whenever imported content is committed, so that anything
+    derived from the database in this process knows to discard it.
+    """
+
+    def __init__(self) -> None:
+        self.value = 0
+
+    def bump(self) -> None:
+        self.value += 1
+
+
+content_version = ContentVersion()
+
+
+class ContentLastModified:
+    """
+    When imported content last changed, from the file metadata in the
+    database, so that every process reports the same time.
+
+    It is looked up again when the content version changes, or after `ttl`
+    seconds to pick up imports run in another process, such as the CLI.
+    """
+
+    def __init__(self, ttl: int | None = None) -> None:
+        self.ttl = ttl
+        self.value: datetime.datetime | None = None
+        self.version: int | None = None
+        self.fetched_at = 0.0
+
+    async def get(self) -> datetime.datetime | None:
+        expired = self.ttl is not None and time.monotonic() - self.fetched_at > self.ttl
+        if self.version != content_version.value or expired:
+            version = content_version.value
+            async with SessionLocal() as db_session:
+                self.value = await get_content_last_modified(db_session=db_session)
+            self.version = version
+            self.fetched_at = time.monotonic()
+        return self.value
+
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    status_code: int
+    headers: dict[str, str]
+    created_at: float
+
+    @classmethod
+    def from_response(
+        cls, response: Response, last_modified: datetime.datetime | None = None
+    ) -> "CachedResponse":
+        body = bytes(response.body)
+        headers = dict(response.headers)
+        # Endpoints that serve pre-rendered content may set their own validators
+        headers.setdefault("etag", make_etag(body))
+        if "last-modified" not in headers and last_modified is not None:
+            headers["last-modified"] = format_http_date(last_modified)
+        return cls(
+            body=body,
+            status_code=response.status_code,
+            headers=headers,
+            created_at=time.monotonic(),
+        )
+
+    def to_response(self, request: Request) -> Response:
+        if is_not_modified(request, self.headers):
+            return not_modified_response(self.headers)
+        return Response(
+            content=self.body, status_code=self.status_code, headers=self.headers
+        )
+
+
+class ResponseCache:
+    """
+    In-memory LRU cache of serialized responses.
+
+    Every entry is dropped when the content version changes. Entries also
+    expire after `ttl` seconds to pick up imports run in another process,
+    such as the CLI.
+    """
+
+    # Query parameters that don't affect the response body
+    ignored_params = {"api_key"}
+
+    def __init__(self, max_size: int, ttl: int | None = None) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self.size = 0
+        self.version = content_version.value
+        self.entries: OrderedDict[str, CachedResponse] = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def key(self, request: Request) -> str:
+        params = sorted(
+            (key, value)
+            for key, value in request.query_params.multi_items()
+            if key not in self.ignored_params
+        )
+        query = "&".join(f"{key}={value}" for key, value in params)
+        return f"{request.url.path}?{query}"
+
+    def get(self, key: str) -> CachedResponse | None:
+        self._check_version()
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if self.ttl is not None and time.monotonic() - entry.created_at > self.ttl:
+            self._remove(key)
+            return None
+        self.entries.move_to_end(key)
+        return entry
+
+    def set(self, key: str, entry: CachedResponse) -> None:
+        if not self.enabled or len(entry.body) > self.max_size:
+            return
+        self._check_version()
+        if key in self.entries:
+            self._remove(key)
+        self.entries[key] = entry
+        self.size += len(entry.body)
+        while self.size > self.max_size:
+            self._remove(next(iter(self.entries)))
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.size = 0
+
+    def _remove(self, key: str) -> None:
+        entry = self.entries.pop(key)
+        self.size -= len(entry.body)
+
+    def _check_version(self) -> None:
+        if self.version != content_version.value:
+            self.clear()
+            self.version = content_version.value
+
+
+response_cache = ResponseCache(
+    max_size=settings.RESPONSE_CACHE_MAX_SIZE, ttl=settings.RESPONSE_CACHE_TTL
+)
+content_last_modified = ContentLastModified(ttl=settings.RESPONSE_CACHE_TTL)
+
+
+class CachedRoute(APIRoute):
+    """
+    Route that serves GET requests from `response_cache`, skipping the
+    endpoint, its database session and response serialization on a hit.
+
+    Responses carry an ETag computed from the body and a Last-Modified of the
+    most recently imported file, and conditional requests are answered with
+    304 Not Modified.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[None, None, Response]]:
+        route_handler = super().get_route_handler()
+        if "GET" not in self.methods:
+            return route_handler
+
+        async def cached_route_handler(request: Request) -> Response:
+            key = response_cache.key(request)
+            cached = response_cache.get(key)
+            if cached is None:
+                response = await route_handler(request)
+                if (
+                    response.status_code != 200
+                    or response.background is not None
+                    or not hasattr(response, "body")
+                ):
+                    return response
+                cached = CachedResponse.from_response(
+                    response, last_modified=await content_last_modified.get()
+                )
+                response_cache.set(key, cached)
+
+            return cached.to_response(request)
+
+        return cached_route_handler
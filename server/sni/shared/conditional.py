@@ -0,0 +1,55 @@
+import datetime
+import hashlib
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Request, Response
+
+
+def make_etag(body: bytes) -> str:
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+def format_http_date(time: datetime.datetime) -> str:
+    # Naive timestamps in the database are in the server's local time
+    return format_datetime(time.astimezone(datetime.timezone.utc), usegmt=True)
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    # If-None-Match uses weak comparison
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def is_not_modified(request: Request, headers: dict[str, str]) -> bool:
+    """
+    Evaluate the request's conditional headers against a response's ETag and
+    Last-Modified. If-None-Match takes precedence over If-Modified-Since.
+    """
+    etag = headers.get("etag")
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag is not None and etag_matches(if_none_match, etag)
+
+    last_modified = headers.get("last-modified")
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(
+            if_modified_since
+        )
+    except (TypeError, ValueError):
+        return False
+
+
+def not_modified_response(headers: dict[str, str]) -> Response:
+    return Response(
+        status_code=304,
+        headers={
+            key: value
+            for key, value in headers.items()
+            if key in ("etag", "last-modified", "cache-control")
+        },
+    )
@@ -1,6 +1,75 @@
+import datetime
 from enum import Enum
 
+from fastapi import Response
+from feedgen.feed import FeedGenerator
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from sni.models import Feed
+
+from .conditional import format_http_date, make_etag
+from .responses import AtomResponse, RSSResponse
+
 
 class FeedFormat(str, Enum):
     rss = "rss"
     atom = "atom"
+
+
+def render_feed(fg: FeedGenerator, format: FeedFormat = FeedFormat.rss) -> bytes:
+    if format == FeedFormat.rss:
+        return fg.rss_str(pretty=True)
+    else:
+        return fg.atom_str(pretty=True)
+
+
+def feed_response(
+    content: bytes,
+    format: FeedFormat = FeedFormat.rss,
+    headers: dict[str, str] | None = None,
+) -> Response:
+    response_class = RSSResponse if format == FeedFormat.rss else AtomResponse
+    return response_class(content=content, headers=headers)
+
+
+def stored_feed_response(feed: Feed) -> Response:
+    return feed_response(
+        feed.content,
+        FeedFormat(feed.format),
+        headers={"etag": feed.etag, "last-modified": format_http_date(feed.updated)},
+    )
+
+
+def save_feed(
+    name: str,
+    locale: str,
+    format: FeedFormat,
+    content: bytes,
+    *,
+    db_session: Session,
+) -> Feed:
+    """Store a rendered feed, leaving it untouched if the content is the same."""
+    etag = make_etag(content)
+    feed = db_session.scalar(
+        select(Feed).filter_by(name=name, locale=locale, format=format.value)
+    )
+    if feed is None:
+        feed = Feed(name=name, locale=locale, format=format.value)
+        db_session.add(feed)
+    elif feed.etag == etag:
+        return feed
+
+    feed.content = content
+    feed.etag = etag
+    feed.updated = datetime.datetime.now()
+    return feed
+
+
+async def get_feed(
+    name: str, locale: str, format: FeedFormat, *, db_session: AsyncSession
+) -> Feed | None:
+    query = select(Feed).filter_by(name=name, locale=locale, format=format.value)
+
+    return await db_session.scalar(query)
@@ -0,0 +1,146 @@
+import base64
+import binascii
+import datetime
+import json
+from dataclasses import dataclass
+from typing import Annotated, Any, Callable, Generic, Sequence, TypeVar
+
+from fastapi import HTTPException, Query, Request, Response
+from sqlalchemy import Select, and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+MAX_PAGE_LIMIT = 1000
+
+T = TypeVar("T")
+
+
+@dataclass
+class KeysetColumn:
+    expression: Any
+    getter: Callable[[Any], Any]
+    descending: bool = False
+
+
+class Keyset:
+    """
+    Ordering used for keyset pagination. The last column must be unique so
+    that the ordering is total, and none of the columns may be NULL.
+    """
+
+    def __init__(self, *columns: KeysetColumn) -> None:
+        self.columns = columns
+
+    def order_by(self) -> list:
+        return [
+            column.expression.desc() if column.descending else column.expression
+            for column in self.columns
+        ]
+
+    def after(self, values: Sequence[Any]):
+        """Condition matching the rows that sort after `values`."""
+        conditions = []
+        for i, column in enumerate(self.columns):
+            value = values[i]
+            if column.descending:
+                comparison = column.expression < value
+            else:
+                comparison = column.expression > value
+            conditions.append(
+                and_(
+                    *(
+                        previous.expression == values[j]
+                        for j, previous in enumerate(self.columns[:i])
+                    ),
+                    comparison,
+                )
+            )
+        return or_(*conditions)
+
+    def encode_cursor(self, item: Any) -> str:
+        values = [column.getter(item) for column in self.columns]
+        data = json.dumps(
+            [
+                value.isoformat() if isinstance(value, datetime.date) else value
+                for value in values
+            ]
+        )
+        return base64.urlsafe_b64encode(data.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, cursor: str) -> list[Any]:
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            values = json.loads(base64.urlsafe_b64decode(padded))
+            if not isinstance(values, list) or len(values) != len(self.columns):
+                raise ValueError("Wrong number of cursor values")
+            return [
+                self._parse_value(column, value)
+                for column, value in zip(self.columns, values)
+            ]
+        except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    @staticmethod
+    def _parse_value(column: KeysetColumn, value: Any) -> Any:
+        python_type = column.expression.type.python_type
+        if python_type is datetime.datetime:
+            return datetime.datetime.fromisoformat(value)
+        if python_type is datetime.date:
+            return datetime.date.fromisoformat(value)
+        if not isinstance(value, python_type):
+            raise TypeError(f"Expected {python_type.__name__} in cursor")
+        return value
+
+
+@dataclass
+class PageParams:
+    limit: Annotated[int | None, Query(ge=1, le=MAX_PAGE_LIMIT)] = None
+    cursor: str | None = None
+
+
+@dataclass
+class Page(Generic[T]):
+    items: Sequence[T]
+    next_cursor: str | None = None
+
+
+async def fetch_page(
+    query: Select,
+    keyset: Keyset,
+    page: PageParams | None = None,
+    *,
+    db_session: AsyncSession,
+) -> Page:
+    """
+    Order `query` by `keyset` and fetch the requested page. Without a limit
+    every row after the cursor is returned.
+    """
+    query = query.order_by(*keyset.order_by())
+    if page is None:
+        page = PageParams()
+    if page.cursor:
+        query = query.filter(keyset.after(keyset.decode_cursor(page.cursor)))
+    if page.limit:
+        # Fetch one extra row to find out whether there is a next page
+        query = query.limit(page.limit + 1)
+
+    result = await db_session.scalars(query)
+    items = result.all()
+
+    if page.limit and len(items) > page.limit:
+        items = items[: page.limit]
+        return Page(items=items, next_cursor=keyset.encode_cursor(items[-1]))
+    return Page(items=items)
+
+
+def page_response(page: Page[T], request: Request, response: Response) -> Sequence[T]:
+    """
+    Return the page's items, advertising the next page in the `Link` and
+    `X-Next-Cursor` headers.
+    """
+    if page.next_cursor:
+        next_url = request.url.remove_query_params("api_key").include_query_params(
+            cursor=page.next_cursor
+        )
+        response.headers["link"] = f'<{next_url}>; rel="next"'
+        response.headers["x-next-cursor"] = page.next_cursor
+    return page.items
@@ -0,0 +1,60 @@
+from dataclasses import dataclass
+from typing import Annotated, Any, Sequence
+
+from fastapi import Query, Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from .schemas import get_list_adapter
+
+
+@dataclass
+class FieldsParams:
+    fields: Annotated[
+        str | None,
+        Query(
+            description=(
+                "Comma-separated list of response fields to include. Only the "
+                "response is trimmed, the same rows are loaded either way."
+            )
+        ),
+    ] = None
+
+    @property
+    def names(self) -> set[str]:
+        if not self.fields:
+            return set()
+        return {name.strip() for name in self.fields.split(",") if name.strip()}
+
+
+def project_fields(
+    items: Sequence[Any],
+    model: type[BaseModel],
+    params: FieldsParams,
+    response: Response,
+) -> Any:
+    """
+    Serialize `items` with `model`, keeping only the requested fields. The
+    items are returned untouched when no fields were requested.
+
+    This only trims the response. The service queries already skip the
+    columns that `model` doesn't use, but load every one that it does.
+    """
+    names = params.names
+    if not names:
+        return items
+
+    adapter = get_list_adapter(model)
+    data = adapter.dump_python(
+        adapter.validate_python(items, from_attributes=True),
+        mode="json",
+        by_alias=True,
+    )
+    return JSONResponse(
+        [{key: value for key, value in item.items() if key in names} for item in data],
+        headers={
+            key: value
+            for key, value in response.headers.items()
+            if key != "content-length"
+        },
+    )
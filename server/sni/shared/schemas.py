@@ -1,9 +1,22 @@
-from pydantic import BaseModel
+from functools import cache
+from typing import Any, Type
+
+from pydantic import BaseModel, TypeAdapter
 from pydantic.alias_generators import to_camel
 
 from sni.constants import Locales
 
 
+@cache
+def get_type_adapter(schema: Any) -> TypeAdapter:
+    """Build each validator and serializer once, rather than on every use."""
+    return TypeAdapter(schema)
+
+
+def get_list_adapter(schema: Type[BaseModel]) -> TypeAdapter:
+    return get_type_adapter(list[schema])
+
+
 class ORMModel(BaseModel):
     class Config:
         alias_generator = to_camel
@@ -1,4 +1,10 @@
-from sqlalchemy import select
+from typing import Any
+
+from sqlalchemy import ColumnElement, Select, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer, with_expression
+
+from sni.models import FileMetadata, MarkdownContent
 
 
 def get(model, *, db_session, **kwargs):
@@ -11,3 +17,106 @@ def get_or_create(model, *, db_session, **kwargs):
         return instance
     else:
         return model(**kwargs)
+
+
+def defer_content_options(model: type[MarkdownContent]) -> list:
+    """Loader options that skip the Markdown source and rendered HTML."""
+    return [defer(model.file_content), defer(model.html_content)]
+
+
+def index_content_options(model: type[MarkdownContent]) -> list:
+    """
+    Loader options for listing Markdown content without its source or HTML,
+    loading only whether there is any HTML.
+    """
+    return [
+        *defer_content_options(model),
+        with_expression(model.has_html_content, model.html_content != ""),
+    ]
+
+
+async def get_with_neighbors(
+    query: Select,
+    sequence: Select,
+    id_column: Any,
+    order_by: Any,
+    target: ColumnElement[bool],
+    *,
+    db_session: AsyncSession,
+) -> tuple[Any, Any, Any]:
+    """
+    Fetch the row matching `target` among the rows selected by `sequence`,
+    along with the rows before and after it in `order_by` order, in one
+    statement. `query` selects the entity to load, with any loader options.
+
+    Returns `(item, previous, next)`; any of them may be None.
+    """
+    ranked = sequence.with_only_columns(
+        id_column.label("id"),
+        target.label("is_target"),
+        func.lag(id_column).over(order_by=order_by).label("previous_id"),
+        func.lead(id_column).over(order_by=order_by).label("next_id"),
+    ).subquery()
+    neighbors = (
+        select(ranked.c.id, ranked.c.previous_id, ranked.c.next_id)
+        .filter(ranked.c.is_target)
+        .subquery()
+    )
+    query = query.add_columns(
+        neighbors.c.id, neighbors.c.previous_id, neighbors.c.next_id
+    ).join(
+        neighbors,
+        or_(
+            id_column == neighbors.c.id,
+            id_column == neighbors.c.previous_id,
+            id_column == neighbors.c.next_id,
+        ),
+    )
+
+    result = await db_session.execute(query)
+    rows = result.unique().all()
+    if not rows:
+        return None, None, None
+
+    items = {row[0].id: row[0] for row in rows}
+    _, item_id, previous_id, next_id = rows[0]
+    return items.get(item_id), items.get(previous_id), items.get(next_id)
+
+
+class LookupCache:
+    """
+    Per-session cache of rows looked up by a single column.
+
+    The first lookup for a (model, column) pair loads the whole table with one
+    query; later lookups are served from memory. Rows created through
+    `get_or_create` are registered so the rest of the run reuses them.
+    """
+
+    def __init__(self, db_session):
+        self.db_session = db_session
+        self._tables = {}
+
+    def _get_table(self, model, column):
+        if (model, column) not in self._tables:
+            rows = self.db_session.scalars(select(model)).unique().all()
+            self._tables[(model, column)] = {getattr(row, column): row for row in rows}
+        return self._tables[(model, column)]
+
+    def get(self, model, **kwargs):
+        ((column, value),) = kwargs.items()
+        return self._get_table(model, column).get(value)
+
+    def get_or_create(self, model, **kwargs):
+        instance = self.get(model, **kwargs)
+        if instance is None:
+            ((column, value),) = kwargs.items()
+            instance = model(**kwargs)
+            self._get_table(model, column)[value] = instance
+        return instance
+
+    def clear(self):
+        self._tables.clear()
+
+
+async def get_content_last_modified(*, db_session: AsyncSession):
+    return await db_session.scalar(select(func.max(FileMetadata.last_modified)))
@@ -9,3 +9,5 @@ class SkepticImporter(JSONImporter):
     model = Skeptic
     file_model = SkepticFile
     content_type = "skeptics"
+    natural_key = ("name_slug", "date")
+    outputs = (Skeptic,)
@@ -1,16 +1,27 @@
 from typing import Any
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from sni.database import get_db
+from sni.shared.cache import CachedRoute
+from sni.shared.pagination import PageParams, page_response
+from sni.shared.projection import FieldsParams, project_fields
 
 from .schemas import SkepticModel
 from .service import get_all
 
-router = APIRouter()
+router = APIRouter(route_class=CachedRoute)
 
 
 @router.get("", response_model=list[SkepticModel])
-async def get_skeptics(db: AsyncSession = Depends(get_db)) -> Any:
-    return await get_all(db_session=db)
+async def get_skeptics(
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(),
+    fields: FieldsParams = Depends(),
+    db: AsyncSession = Depends(get_db),
+) -> Any:
+    skeptics = await get_all(db_session=db, page=page)
+    items = page_response(skeptics, request, response)
+    return project_fields(items, SkepticModel, fields, response)
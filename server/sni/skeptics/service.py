@@ -1,13 +1,18 @@
-from typing import Sequence
-
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from sni.models import Skeptic
+from sni.shared.pagination import Keyset, KeysetColumn, Page, PageParams, fetch_page
+
+skeptic_keyset = Keyset(
+    KeysetColumn(Skeptic.date, lambda skeptic: skeptic.date),
+    KeysetColumn(Skeptic.id, lambda skeptic: skeptic.id),
+)
 
 
-async def get_all(*, db_session: AsyncSession) -> Sequence[Skeptic]:
-    query = select(Skeptic).order_by(Skeptic.date)
+async def get_all(
+    *, db_session: AsyncSession, page: PageParams | None = None
+) -> Page[Skeptic]:
+    query = select(Skeptic)
 
-    result = await db_session.scalars(query)
-    return result.all()
+    return await fetch_page(query, skeptic_keyset, page, db_session=db_session)
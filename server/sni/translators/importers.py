@@ -8,5 +8,6 @@ class TranslatorImporter(MarkdownImporter):
     directory_path = "content/translators"
     content_type = "Translator"
     model = Translator
+    outputs = (Translator,)
     schema = TranslatorMDModel
     content_key = "translator"
@@ -19,3 +19,9 @@ def localize_time(time: datetime.datetime, tz: str = "America/Chicago"):
     localized_time = time.replace(tzinfo=ZoneInfo(tz))
 
     return localized_time
+
+
+def to_naive_utc(time: datetime.datetime) -> datetime.datetime:
+    if time.tzinfo is None:
+        return time
+    return time.astimezone(datetime.timezone.utc).replace(tzinfo=None)
@@ -0,0 +1,70 @@
+import asyncio
+import os
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+# Settings are read when sni is first imported
+os.environ.update(
+    {
+        "ENVIRONMENT": "LOCAL",
+        "SQLALCHEMY_DATABASE_URI": "sqlite+aiosqlite://",
+        "CDN_BASE_URL": "https://cdn.example.com",
+        "RENDER_CACHE_DIR": "",
+    }
+)
+
+import sni.models  # noqa: E402, F401
+from sni.database import Base  # noqa: E402
+
+
+@pytest.fixture
+def event_loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture
+def run(event_loop):
+    """Run a coroutine to completion in the test's event loop."""
+    return event_loop.run_until_complete
+
+
+@pytest.fixture
+def async_engine(run):
+    """Async engine for an empty in-memory database with every table."""
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+
+    async def create_all():
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+
+    run(create_all())
+    yield engine
+    run(engine.dispose())
+
+
+@pytest.fixture
+def async_session(run, async_engine):
+    db_session = AsyncSession(async_engine, expire_on_commit=False)
+    yield db_session
+    run(db_session.close())
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """Sync engine for an empty database file with every table."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'sni.db'}")
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db_session(engine):
+    with Session(engine) as db_session:
+        yield db_session
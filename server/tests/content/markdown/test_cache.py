@@ -0,0 +1,82 @@
+import datetime
+import os
+import pickle
+
+import pytest
+
+from sni.config import PROJECT_ROOT, Settings
+from sni.content.markdown.cache import RenderCache
+
+RENDERED = ({"title": "Bitcoin", "date": datetime.date(2008, 10, 31)}, "<p>Text</p>")
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return RenderCache(str(tmp_path), fingerprint="renderer-1", max_size=1024)
+
+
+def test_miss_then_hit(cache):
+    key = cache.key("Text")
+    assert cache.get(key) is None
+    cache.set(key, RENDERED)
+    assert cache.get(key) == RENDERED
+
+
+def test_key_depends_on_content_and_fingerprint(cache, tmp_path):
+    other = RenderCache(str(tmp_path), fingerprint="renderer-2", max_size=1024)
+    assert cache.key("Text") != cache.key("Other text")
+    assert cache.key("Text") != other.key("Text")
+
+
+def test_entry_from_another_fingerprint_ignored(cache, tmp_path):
+    other = RenderCache(str(tmp_path), fingerprint="renderer-2", max_size=1024)
+    key = cache.key("Text")
+    other.set(key, RENDERED)
+    assert cache.get(key) is None
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b"not a pickle",
+        pickle.dumps(RENDERED),
+        pickle.dumps(("renderer-1", os.getcwd)),
+    ],
+    ids=["corrupt", "no_fingerprint", "disallowed_class"],
+)
+def test_invalid_entry_ignored(cache, data):
+    key = cache.key("Text")
+    with open(cache._path(key), "wb") as file:
+        file.write(data)
+    assert cache.get(key) is None
+
+
+def test_prune_evicts_least_recently_used(tmp_path):
+    cache = RenderCache(str(tmp_path), fingerprint="renderer-1", max_size=0)
+    keys = [cache.key(str(i)) for i in range(3)]
+    for i, key in enumerate(keys):
+        cache.set(key, ({}, "x" * 100))
+        os.utime(cache._path(key), (i, i))
+    entry_size = os.path.getsize(cache._path(keys[0]))
+    cache.max_size = entry_size * 2
+
+    # Reading an entry makes it the most recently used
+    assert cache.get(keys[0]) is not None
+    cache.prune()
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[2]) is not None
+
+
+def test_prune_missing_directory(tmp_path):
+    cache = RenderCache(str(tmp_path / "missing"), fingerprint="", max_size=0)
+    cache.prune()
+
+
+def test_relative_directory_resolved_against_project_root():
+    settings = Settings(RENDER_CACHE_DIR=".cache/markdown")
+    assert settings.RENDER_CACHE_DIR == os.path.join(PROJECT_ROOT, ".cache", "markdown")
+    assert Settings(RENDER_CACHE_DIR="/tmp/markdown").RENDER_CACHE_DIR == (
+        "/tmp/markdown"
+    )
@@ -0,0 +1,66 @@
+import pytest
+
+from sni.content.markdown.renderer import MDRender, rewrite_static_urls
+
+CDN = "https://cdn.example.com"
+
+
+def render(md_content: str) -> str:
+    _, html_content = MDRender.render(md_content)
+    return html_content
+
+
+@pytest.mark.parametrize(
+    "md_content, expected",
+    [
+        ("![Chart](/static/img/chart.png)", f'src="{CDN}/img/chart.png"'),
+        ("[Paper](/static/docs/paper.pdf)", f'href="{CDN}/docs/paper.pdf"'),
+        (
+            '<div>\n<img src="/static/img/chart.png">\n</div>',
+            f'src="{CDN}/img/chart.png"',
+        ),
+        (
+            'See <a href="/static/docs/paper.pdf">the paper</a>.',
+            f'href="{CDN}/docs/paper.pdf"',
+        ),
+    ],
+    ids=["image", "link_open", "html_block", "html_inline"],
+)
+def test_static_urls_point_at_cdn(md_content, expected):
+    html_content = render(md_content)
+    assert expected in html_content
+    assert '"/static' not in html_content
+
+
+@pytest.mark.parametrize(
+    "md_content",
+    [
+        "![Chart](/img/chart.png)",
+        "[Library](/library/bitcoin/)",
+        "[Elsewhere](https://example.com/static/paper.pdf)",
+        '<div>\n<img src="https://example.com/static/chart.png">\n</div>',
+        'See <a href="/library/bitcoin/">the paper</a>.',
+    ],
+    ids=["image", "link_open", "external_link", "html_block", "html_inline"],
+)
+def test_other_urls_unchanged(md_content):
+    assert CDN not in render(md_content)
+
+
+def test_only_img_src_and_a_href_rewritten_in_raw_html():
+    html_content = (
+        '<img alt="/static/chart.png" src="/static/chart.png">'
+        '<a title="/static/paper.pdf" href=/static/paper.pdf>Paper</a>'
+        '<link href="/static/style.css">'
+    )
+    assert rewrite_static_urls(html_content) == (
+        f'<img alt="/static/chart.png" src="{CDN}/chart.png">'
+        f'<a title="/static/paper.pdf" href={CDN}/paper.pdf>Paper</a>'
+        '<link href="/static/style.css">'
+    )
+
+
+def test_front_matter():
+    front_matter, html_content = MDRender.render("---\ntitle: Bitcoin\n---\n\nText")
+    assert front_matter == {"title": "Bitcoin"}
+    assert html_content == "<p>Text</p>"
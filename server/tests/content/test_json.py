@@ -0,0 +1,255 @@
+import datetime
+import io
+import json
+
+import pytest
+from sqlalchemy import select
+
+from sni.content.json import batched, iter_json_array
+from sni.models import Email, Skeptic
+from sni.satoshi.emails.importers import EmailImporter
+from sni.skeptics.importers import SkepticImporter
+
+DOCUMENT = """[
+    {"text": "She said \\"hi\\"\\n", "escapes": "\\\\ \\/ \\u00e9 \\ud83d\\ude00 ]},"},
+    {"nested": {"list": [1, [2, {"three": 3}]], "empty": {}}, "none": null},
+    12345678,
+    -1.5e-10,
+    0.25,
+    true,
+    false,
+    "",
+    [],
+    {}
+]"""
+
+
+def parse(text: str, chunk_size: int) -> list:
+    return list(iter_json_array(io.StringIO(text), chunk_size=chunk_size))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 8, 64 * 1024])
+def test_iter_json_array_across_chunks(chunk_size):
+    assert parse(DOCUMENT, chunk_size) == json.loads(DOCUMENT)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 4, 64 * 1024])
+@pytest.mark.parametrize("text", ["[]", " [ ] ", "\n[\n]\n"])
+def test_iter_json_array_empty(text, chunk_size):
+    assert parse(text, chunk_size) == []
+
+
+@pytest.mark.parametrize("chunk_size", [1, 64 * 1024])
+@pytest.mark.parametrize("text", ['{"a": [1]}', "1", '"[1]"', "null", ""])
+def test_iter_json_array_not_an_array(text, chunk_size):
+    with pytest.raises(ValueError):
+        parse(text, chunk_size)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 64 * 1024])
+@pytest.mark.parametrize(
+    "text",
+    [
+        "[",
+        "[1",
+        "[1,",
+        '[{"a": 1}',
+        '[{"a": 1',
+        '["abc',
+        '["abc\\',
+        "[12",
+        "[1 2]",
+        "[1,,2]",
+        "[1,]",
+        "[,1]",
+    ],
+)
+def test_iter_json_array_invalid(text, chunk_size):
+    with pytest.raises(ValueError):
+        parse(text, chunk_size)
+
+
+def test_iter_json_array_is_lazy():
+    records = iter_json_array(io.StringIO('[{"a": 1}, {"b": 2}, tru'), chunk_size=4)
+    assert next(records) == {"a": 1}
+    assert next(records) == {"b": 2}
+    with pytest.raises(ValueError):
+        next(records)
+
+
+@pytest.mark.parametrize(
+    "size, expected",
+    [
+        (1, [[0], [1], [2], [3], [4]]),
+        (2, [[0, 1], [2, 3], [4]]),
+        (5, [[0, 1, 2, 3, 4]]),
+        (6, [[0, 1, 2, 3, 4]]),
+    ],
+)
+def test_batched(size, expected):
+    assert list(batched(range(5), size)) == expected
+    assert list(batched(iter(range(5)), size)) == expected
+
+
+def test_batched_empty():
+    assert list(batched([], 3)) == []
+
+
+def make_skeptic(i: int, **fields) -> dict:
+    return {
+        "name": f"Skeptic {i}",
+        "name_slug": f"skeptic-{i}",
+        "title": "Bitcoin is dead",
+        "date": f"2010-01-{i + 1:02}",
+        "source": "",
+        "link": "",
+        **fields,
+    }
+
+
+@pytest.fixture
+def skeptic_importer(tmp_path):
+    class StreamingSkepticImporter(SkepticImporter):
+        file_path = str(tmp_path / "skeptics.json")
+        streaming = True
+        bulk_insert_batch_size = 2
+
+    return StreamingSkepticImporter
+
+
+def write_json(path: str, data):
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(data, file)
+
+
+def test_stream_json_data_batches(db_session, skeptic_importer):
+    write_json(skeptic_importer.file_path, [make_skeptic(i) for i in range(5)])
+    batches = list(
+        skeptic_importer(db_session).stream_json_data(skeptic_importer.file_path)
+    )
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert batches[2][0]["date"] == datetime.date(2010, 1, 5)
+
+
+def test_stream_json_data_invalid_record(db_session, skeptic_importer, capsys):
+    records = [make_skeptic(i) for i in range(7)]
+    del records[3]["title"]
+    records[6]["date"] = "not a date"
+    write_json(skeptic_importer.file_path, records)
+
+    batches = skeptic_importer(db_session).stream_json_data(skeptic_importer.file_path)
+    assert [record["name_slug"] for record in next(batches)] == [
+        "skeptic-0",
+        "skeptic-1",
+    ]
+    with pytest.raises(ValueError, match="Invalid records"):
+        next(batches)
+
+    # The rest of the file is still validated, so every error is reported
+    output = capsys.readouterr().out
+    assert "2 invalid records" in output
+    assert "Record 3:\n    title: Field required" in output
+    assert "Record 6:\n    date:" in output
+
+
+def test_stream_json_data_truncated(db_session, skeptic_importer, capsys):
+    text = json.dumps([make_skeptic(i) for i in range(3)])
+    with open(skeptic_importer.file_path, "w", encoding="utf-8") as file:
+        file.write(text[:-20])
+
+    batches = skeptic_importer(db_session).stream_json_data(skeptic_importer.file_path)
+    assert len(next(batches)) == 2
+    with pytest.raises(ValueError):
+        next(batches)
+    assert "Error loading JSON data" in capsys.readouterr().out
+
+
+def test_stream_json_data_unreadable(db_session, skeptic_importer, capsys):
+    batches = skeptic_importer(db_session).stream_json_data(skeptic_importer.file_path)
+    assert list(batches) == []
+    assert "Error loading JSON data" in capsys.readouterr().out
+
+
+def import_data(importer_cls, db_session):
+    importer = importer_cls(db_session)
+    importer.import_data()
+    db_session.commit()
+    return importer.actions
+
+
+def test_sync_data(db_session, skeptic_importer):
+    records = [make_skeptic(i) for i in range(5)]
+    write_json(skeptic_importer.file_path, records)
+    assert import_data(skeptic_importer, db_session) == {
+        "new": 5,
+        "updated": 0,
+        "deleted": 0,
+    }
+    ids = dict(db_session.execute(select(Skeptic.name_slug, Skeptic.id)).all())
+
+    records[1]["title"] = "Bitcoin is dead again"
+    del records[3]
+    records.append(make_skeptic(5))
+    write_json(skeptic_importer.file_path, records)
+    assert import_data(skeptic_importer, db_session) == {
+        "new": 1,
+        "updated": 1,
+        "deleted": 1,
+    }
+
+    skeptics = db_session.scalars(select(Skeptic).order_by(Skeptic.date)).all()
+    assert [skeptic.name_slug for skeptic in skeptics] == [
+        "skeptic-0",
+        "skeptic-1",
+        "skeptic-2",
+        "skeptic-4",
+        "skeptic-5",
+    ]
+    assert skeptics[1].title == "Bitcoin is dead again"
+    # Matched rows are updated in place
+    assert all(skeptic.id == ids[skeptic.name_slug] for skeptic in skeptics[:4])
+
+
+def make_email(id: int, source_id: str, satoshi_id: int | None = None) -> dict:
+    return {
+        "id": id,
+        "sent_from": "",
+        "subject": f"Email {id}",
+        "text": "",
+        "date": "2008-11-01T00:00:00Z",
+        "url": "",
+        "thread_id": 1,
+        "source_id": source_id,
+        "satoshi_id": satoshi_id,
+    }
+
+
+@pytest.mark.parametrize("new_id", [4, 5], ids=["same_id", "new_id"])
+def test_sync_data_reuses_unique_values(db_session, tmp_path, new_id):
+    class StreamingEmailImporter(EmailImporter):
+        file_path = str(tmp_path / "emails.json")
+        bulk_insert_batch_size = 2
+
+    records = [make_email(i, f"email-{i}", satoshi_id=i) for i in range(1, 5)]
+    write_json(StreamingEmailImporter.file_path, records)
+    import_data(StreamingEmailImporter, db_session)
+
+    # A new email in the first batch takes over the satoshi_id, and maybe the
+    # id, of an email removed from the last batch
+    records = [make_email(new_id, "email-new", satoshi_id=4), *records[:3]]
+    write_json(StreamingEmailImporter.file_path, records)
+    assert import_data(StreamingEmailImporter, db_session) == {
+        "new": 1,
+        "updated": 0,
+        "deleted": 1,
+    }
+
+    emails = db_session.execute(
+        select(Email.id, Email.source_id, Email.satoshi_id).order_by(Email.id)
+    ).all()
+    assert emails == [
+        (1, "email-1", 1),
+        (2, "email-2", 2),
+        (3, "email-3", 3),
+        (new_id, "email-new", 4),
+    ]
@@ -0,0 +1,278 @@
+import datetime
+import threading
+import time
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from sni.content.scheduler import ImportScheduler, ImportTask
+from sni.models import (
+    Author,
+    Document,
+    DocumentTranslation,
+    Email,
+    EmailThread,
+    Feed,
+    Skeptic,
+)
+
+
+def task(name, inputs=(), outputs=(), run=None, **kwargs) -> ImportTask:
+    return ImportTask(
+        name=name,
+        run=run or (lambda db_session, force: False),
+        inputs=inputs,
+        outputs=outputs,
+        **kwargs,
+    )
+
+
+@contextmanager
+def null_scope():
+    yield None
+
+
+class RecordingSession:
+    def commit(self):
+        pass
+
+
+@contextmanager
+def recording_scope():
+    yield RecordingSession()
+
+
+# Two independent chains, and a feed task that reads from both
+TASKS = [
+    task("Feeds", inputs=(Email, DocumentTranslation), outputs=(Feed,)),
+    task("Emails", inputs=(EmailThread,), outputs=(Email,)),
+    task("Library", inputs=(Author,), outputs=(Document, DocumentTranslation)),
+    task("EmailThreads", outputs=(EmailThread,)),
+    task("Authors", outputs=(Author,)),
+    task("Skeptics", outputs=(Skeptic,)),
+]
+
+
+def names(tasks) -> list[str]:
+    return [task.name for task in tasks]
+
+
+def test_dependencies_from_inputs_and_outputs():
+    scheduler = ImportScheduler(TASKS, null_scope)
+    assert names(scheduler.dependencies["Feeds"]) == ["Emails", "Library"]
+    assert names(scheduler.dependencies["Emails"]) == ["EmailThreads"]
+    assert scheduler.dependencies["Skeptics"] == []
+
+
+def test_ordered_tasks():
+    scheduler = ImportScheduler(TASKS, null_scope)
+    assert names(scheduler.ordered_tasks()) == [
+        "EmailThreads",
+        "Emails",
+        "Authors",
+        "Library",
+        "Feeds",
+        "Skeptics",
+    ]
+
+
+def test_ordered_tasks_cycle():
+    tasks = [
+        task("A", inputs=(Email,), outputs=(EmailThread,)),
+        task("B", inputs=(EmailThread,), outputs=(Email,)),
+    ]
+    with pytest.raises(ValueError, match="dependency cycle: A, B"):
+        ImportScheduler(tasks, null_scope).ordered_tasks()
+
+
+def test_branches():
+    scheduler = ImportScheduler(TASKS, null_scope)
+    assert [names(branch) for branch in scheduler.branches()] == [
+        ["EmailThreads", "Emails", "Authors", "Library", "Feeds"],
+        ["Skeptics"],
+    ]
+
+    # Without the feeds, the email and library chains are independent
+    scheduler = ImportScheduler(TASKS[1:], null_scope)
+    assert [names(branch) for branch in scheduler.branches()] == [
+        ["EmailThreads", "Emails"],
+        ["Authors", "Library"],
+        ["Skeptics"],
+    ]
+
+
+def test_changed_inputs_force_import():
+    calls = {}
+
+    def make(name, changed, **kwargs):
+        def run_task(db_session, force):
+            calls[name] = force
+            return changed
+
+        return task(name, run=run_task, **kwargs)
+
+    tasks = [
+        make("EmailThreads", True, outputs=(EmailThread,)),
+        make("Emails", False, inputs=(EmailThread,), outputs=(Email,)),
+        make("Feeds", False, inputs=(Email,), outputs=(Feed,)),
+        make("Authors", True, outputs=(Author,)),
+        make(
+            "Library",
+            False,
+            inputs=(Author,),
+            outputs=(Document,),
+            follows_inputs=False,
+        ),
+        make("Skeptics", False, outputs=(Skeptic,)),
+    ]
+    scheduler = ImportScheduler(tasks, recording_scope)
+    assert scheduler.run() is True
+
+    # A reimport forced by changed inputs counts as a change downstream
+    assert calls == {
+        "EmailThreads": False,
+        "Emails": True,
+        "Feeds": True,
+        "Authors": False,
+        "Library": False,
+        "Skeptics": False,
+    }
+    assert scheduler.changed["Feeds"] is True
+    assert scheduler.changed["Library"] is False
+
+
+def test_nothing_changed():
+    scheduler = ImportScheduler(TASKS, recording_scope)
+    assert scheduler.run() is False
+
+
+@pytest.fixture
+def session_scope(engine):
+    @contextmanager
+    def session_scope():
+        db_session = Session(engine)
+        try:
+            yield db_session
+            db_session.commit()
+        except Exception:
+            db_session.rollback()
+            raise
+        finally:
+            db_session.close()
+
+    return session_scope
+
+
+def add_skeptic(db_session, force):
+    db_session.add(
+        Skeptic(
+            name="Skeptic",
+            name_slug="skeptic",
+            title="Bitcoin is dead",
+            date=datetime.date(2010, 1, 1),
+            source="",
+            link="",
+            file_id=1,
+        )
+    )
+    db_session.flush()
+    return True
+
+
+def add_thread(db_session, force):
+    db_session.add(
+        EmailThread(
+            title="Thread",
+            date=datetime.datetime(2008, 11, 1),
+            url="",
+            source="cryptography",
+            file_id=1,
+        )
+    )
+    db_session.flush()
+    return True
+
+
+def fail(db_session, force):
+    raise RuntimeError("Import failed")
+
+
+def count(engine, model) -> int:
+    with Session(engine) as db_session:
+        return db_session.scalar(select(func.count()).select_from(model))
+
+
+def test_failed_branch_rolls_back_alone(engine, session_scope):
+    tasks = [
+        task("EmailThreads", outputs=(EmailThread,), run=add_thread),
+        task("Emails", inputs=(EmailThread,), outputs=(Email,), run=fail),
+        task("Skeptics", outputs=(Skeptic,), run=add_skeptic),
+    ]
+    scheduler = ImportScheduler(tasks, session_scope)
+    with pytest.raises(RuntimeError, match="Import failed"):
+        scheduler.run()
+
+    # The thread was imported in the same transaction as the failed emails
+    assert count(engine, EmailThread) == 0
+    assert count(engine, Skeptic) == 1
+
+
+def test_branch_output_not_interleaved(capsys):
+    # Each branch prints half a line, waits for the other, then finishes it
+    printed = [threading.Event(), threading.Event()]
+
+    def make_run(name, index):
+        def run_task(db_session, force):
+            print(f"Importing {name}...", end="")
+            printed[index].set()
+            printed[1 - index].wait(timeout=5)
+            print("DONE")
+            return False
+
+        return run_task
+
+    tasks = [
+        task("Emails", outputs=(Email,), run=make_run("Emails", 0)),
+        task("Skeptics", outputs=(Skeptic,), run=make_run("Skeptics", 1)),
+    ]
+    ImportScheduler(tasks, recording_scope).run()
+
+    lines = sorted(capsys.readouterr().out.splitlines())
+    assert lines == ["Importing Emails...DONE", "Importing Skeptics...DONE"]
+
+
+def test_failed_branch_output(capsys):
+    def fail_loudly(db_session, force):
+        print("Importing Emails...", end="")
+        fail(db_session, force)
+
+    tasks = [task("Emails", outputs=(Email,), run=fail_loudly)]
+    with pytest.raises(RuntimeError):
+        ImportScheduler(tasks, recording_scope).run()
+    assert capsys.readouterr().out == "Importing Emails..."
+
+
+def test_timing_report(capsys):
+    def slow(db_session, force):
+        time.sleep(0.05)
+        return False
+
+    tasks = [
+        task("EmailThreads", outputs=(EmailThread,)),
+        task("Emails", inputs=(EmailThread,), outputs=(Email,), run=slow),
+        task("Skeptics", outputs=(Skeptic,)),
+    ]
+    scheduler = ImportScheduler(tasks, recording_scope)
+    scheduler.run()
+    scheduler.print_timing_report()
+
+    report = capsys.readouterr().out
+    assert "Branch 1 (critical path)" in report
+    assert "Branch 2\n" in report
+    assert "Critical path: EmailThreads -> Emails -> Commit" in report
+    assert [timing.name for timing in scheduler.timings if timing.branch == 1] == [
+        "Skeptics",
+        "Commit",
+    ]
@@ -0,0 +1,102 @@
+import datetime
+
+import pytest
+
+from sni.models import Email, EmailThread
+from sni.satoshi.emails.schemas import ThreadEmailModel
+from sni.satoshi.emails.service import get_thread_email_tree
+
+DATE = datetime.datetime(2008, 11, 1)
+
+
+def make_email(id, thread, parent=None, satoshi_id=None) -> Email:
+    return Email(
+        id=id,
+        satoshi_id=satoshi_id,
+        url="",
+        subject=f"Email {id}",
+        sent_from="",
+        date=DATE + datetime.timedelta(hours=id),
+        text="",
+        source_id=f"email-{id}",
+        parent=parent,
+        thread=thread,
+        file_id=1,
+    )
+
+
+@pytest.fixture
+def threads(run, async_session):
+    """
+    Email 1 in thread 1 has a reply in thread 1 and another, email 3, in
+    thread 2. Email 4 in thread 2 replies to email 3.
+    """
+    thread_1, thread_2 = (
+        EmailThread(
+            id=id,
+            title=f"Thread {id}",
+            date=DATE,
+            url="",
+            source="cryptography",
+            file_id=1,
+        )
+        for id in (1, 2)
+    )
+    email_1 = make_email(1, thread_1, satoshi_id=1)
+    email_2 = make_email(2, thread_1, parent=email_1)
+    email_3 = make_email(3, thread_2, parent=email_1, satoshi_id=2)
+    email_4 = make_email(4, thread_2, parent=email_3)
+    async_session.add_all([email_1, email_2, email_3, email_4])
+    run(async_session.commit())
+    async_session.expunge_all()
+    return thread_1, thread_2
+
+
+def replies(email: Email) -> list[str]:
+    return sorted(reply.source_id for reply in email.replies)
+
+
+def test_replies_include_other_threads(run, async_session, threads):
+    thread_1, _ = threads
+    emails = run(get_thread_email_tree(thread_1, db_session=async_session))
+
+    assert [email.source_id for email in emails] == ["email-1", "email-2"]
+    assert replies(emails[0]) == ["email-2", "email-3"]
+    assert replies(emails[1]) == []
+    assert emails[1].parent is emails[0]
+    assert emails[0].parent is None
+
+
+def test_parent_in_other_thread(run, async_session, threads):
+    _, thread_2 = threads
+    emails = run(get_thread_email_tree(thread_2, db_session=async_session))
+
+    assert [email.source_id for email in emails] == ["email-3", "email-4"]
+    assert emails[0].parent.source_id == "email-1"
+    assert replies(emails[0].parent) == ["email-2", "email-3"]
+    assert replies(emails[0]) == ["email-4"]
+    assert emails[1].parent is emails[0]
+
+
+def test_satoshi_only(run, async_session, threads):
+    thread_1, _ = threads
+    emails = run(
+        get_thread_email_tree(thread_1, satoshi=True, db_session=async_session)
+    )
+
+    assert [email.source_id for email in emails] == ["email-1"]
+    assert replies(emails[0]) == ["email-2", "email-3"]
+
+
+def test_serialized_tree(run, async_session, threads):
+    _, thread_2 = threads
+    emails = run(get_thread_email_tree(thread_2, db_session=async_session))
+
+    data = [
+        ThreadEmailModel.model_validate(email).model_dump(by_alias=True)
+        for email in emails
+    ]
+    assert data[0]["replies"] == ["email-4"]
+    assert data[0]["parent"]["replies"] == ["email-2", "email-3"]
+    assert data[0]["parent"]["source"] == "cryptography"
+    assert data[1]["parent"]["sourceId"] == "email-3"
@@ -0,0 +1,148 @@
+import datetime
+
+import pytest
+from fastapi import APIRouter, FastAPI, Response
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from sni.models import FileMetadata
+from sni.shared import cache
+from sni.shared.cache import (
+    CachedResponse,
+    CachedRoute,
+    ContentLastModified,
+    ResponseCache,
+    content_version,
+)
+from sni.shared.conditional import make_etag
+
+IMPORTED_AT = datetime.datetime(2008, 10, 31, 18, 10, tzinfo=datetime.timezone.utc)
+LAST_MODIFIED = "Fri, 31 Oct 2008 18:10:00 GMT"
+
+
+@pytest.fixture
+def body():
+    """The body served by the test route, which tests can change."""
+    return {"text": "Bitcoin"}
+
+
+@pytest.fixture
+def response_cache(monkeypatch):
+    response_cache = ResponseCache(max_size=1024 * 1024, ttl=60)
+    monkeypatch.setattr(cache, "response_cache", response_cache)
+    return response_cache
+
+
+@pytest.fixture
+def lookups(monkeypatch):
+    """Stand in for the database lookup of the last import, counting calls."""
+    lookups = []
+
+    async def get_content_last_modified(*, db_session):
+        lookups.append(db_session)
+        return IMPORTED_AT
+
+    monkeypatch.setattr(cache, "get_content_last_modified", get_content_last_modified)
+    monkeypatch.setattr(cache, "content_last_modified", ContentLastModified(ttl=60))
+    return lookups
+
+
+@pytest.fixture
+def client(body, response_cache, lookups):
+    router = APIRouter(route_class=CachedRoute)
+
+    @router.get("/content")
+    async def content():
+        return body
+
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app)
+
+
+def test_validators(client):
+    response = client.get("/content")
+    assert response.status_code == 200
+    assert response.headers["etag"] == make_etag(response.content)
+    assert response.headers["last-modified"] == LAST_MODIFIED
+
+
+def test_not_modified(client):
+    response = client.get("/content")
+    etag = response.headers["etag"]
+
+    response = client.get("/content", headers={"if-none-match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+    response = client.get("/content", headers={"if-modified-since": LAST_MODIFIED})
+    assert response.status_code == 304
+
+    response = client.get(
+        "/content", headers={"if-modified-since": "Thu, 30 Oct 2008 18:10:00 GMT"}
+    )
+    assert response.status_code == 200
+
+    response = client.get("/content", headers={"if-none-match": '"other"'})
+    assert response.status_code == 200
+
+
+def test_last_modified_looked_up_once_per_version(client, response_cache, lookups):
+    client.get("/content")
+    client.get("/content?page=2")
+    client.get("/content?page=3")
+    assert len(lookups) == 1
+
+    content_version.bump()
+    client.get("/content")
+    assert len(lookups) == 2
+
+
+def test_last_modified_looked_up_after_ttl(client, response_cache, lookups):
+    client.get("/content")
+    cache.content_last_modified.fetched_at -= 61
+    response_cache.clear()
+
+    client.get("/content")
+    assert len(lookups) == 2
+
+
+def test_endpoint_validators_kept():
+    response = Response(
+        content=b"new", headers={"etag": '"feed"', "last-modified": "feed date"}
+    )
+    cached = CachedResponse.from_response(response, last_modified=IMPORTED_AT)
+    assert cached.headers["etag"] == '"feed"'
+    assert cached.headers["last-modified"] == "feed date"
+
+
+def test_no_last_modified_without_content():
+    cached = CachedResponse.from_response(Response(content=b"body"))
+    assert "last-modified" not in cached.headers
+
+
+def add_file(run, async_session, last_modified: datetime.datetime):
+    async_session.add(
+        FileMetadata(filename="data/emails.json", hash="", last_modified=last_modified)
+    )
+    run(async_session.commit())
+
+
+def test_last_modified_from_file_metadata(
+    run, async_engine, async_session, monkeypatch
+):
+    monkeypatch.setattr(cache, "SessionLocal", lambda: AsyncSession(async_engine))
+    imported_at = datetime.datetime(2008, 10, 31, 18, 10)
+    add_file(run, async_session, imported_at)
+    add_file(run, async_session, imported_at - datetime.timedelta(days=1))
+
+    # Each worker process has its own instance, and they all agree
+    workers = [ContentLastModified(ttl=60) for _ in range(2)]
+    assert [run(worker.get()) for worker in workers] == [imported_at] * 2
+
+    later = imported_at + datetime.timedelta(hours=1)
+    add_file(run, async_session, later)
+    assert run(workers[0].get()) == imported_at
+    content_version.bump()
+    assert run(workers[0].get()) == later
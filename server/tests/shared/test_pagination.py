@@ -0,0 +1,129 @@
+import base64
+import datetime
+import json
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+
+from sni.models import Skeptic
+from sni.shared.pagination import Keyset, KeysetColumn, PageParams, fetch_page
+from sni.skeptics.service import get_all, skeptic_keyset
+
+# Several skeptics share each date, so the date alone doesn't order them
+DATES = [datetime.date(2010, 1, 1 + i // 3) for i in range(10)]
+
+descending_keyset = Keyset(
+    KeysetColumn(Skeptic.date, lambda skeptic: skeptic.date, descending=True),
+    KeysetColumn(Skeptic.id, lambda skeptic: skeptic.id),
+)
+
+
+def encode(values) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+@pytest.fixture
+def skeptics(run, async_session):
+    skeptics = [
+        Skeptic(
+            name=f"Skeptic {i}",
+            name_slug=f"skeptic-{i}",
+            title="Bitcoin is dead",
+            date=date,
+            source="",
+            link="",
+            file_id=1,
+        )
+        # Insert out of order so that ids don't follow dates
+        for i, date in reversed(list(enumerate(DATES)))
+    ]
+    async_session.add_all(skeptics)
+    run(async_session.commit())
+    return skeptics
+
+
+def fetch_all_pages(run, async_session, keyset, limit):
+    items, cursor, pages = [], None, 0
+    while True:
+        page = run(
+            fetch_page(
+                select(Skeptic),
+                keyset,
+                PageParams(limit=limit, cursor=cursor),
+                db_session=async_session,
+            )
+        )
+        items.extend(page.items)
+        pages += 1
+        if page.next_cursor is None:
+            return items, pages
+        cursor = page.next_cursor
+
+
+def test_cursor_round_trip(skeptics):
+    skeptic = skeptics[0]
+    cursor = skeptic_keyset.encode_cursor(skeptic)
+    assert "=" not in cursor
+    assert skeptic_keyset.decode_cursor(cursor) == [skeptic.date, skeptic.id]
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not base64!",
+        "e30",  # {}
+        base64.urlsafe_b64encode(b"\xff\xfe").decode(),
+        encode(["2010-01-01"]),
+        encode(["2010-01-01", 1, 2]),
+        encode(["January 1st", 1]),
+        encode(["2010-01-01", "1"]),
+        encode([20100101, 1]),
+    ],
+    ids=[
+        "invalid_base64",
+        "not_a_list",
+        "not_utf8",
+        "too_few_values",
+        "too_many_values",
+        "invalid_date",
+        "string_id",
+        "integer_date",
+    ],
+)
+def test_invalid_cursor(cursor):
+    with pytest.raises(HTTPException) as exc_info:
+        skeptic_keyset.decode_cursor(cursor)
+    assert exc_info.value.status_code == 400
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 4, 10])
+@pytest.mark.parametrize(
+    "keyset, reverse",
+    [(skeptic_keyset, False), (descending_keyset, True)],
+    ids=["ascending", "descending"],
+)
+def test_pages_cover_ordering_once(
+    run, async_session, skeptics, limit, keyset, reverse
+):
+    expected = sorted(
+        skeptics,
+        key=lambda skeptic: (
+            -skeptic.date.toordinal() if reverse else skeptic.date.toordinal(),
+            skeptic.id,
+        ),
+    )
+    items, pages = fetch_all_pages(run, async_session, keyset, limit)
+    assert [item.id for item in items] == [skeptic.id for skeptic in expected]
+    assert pages == -(-len(skeptics) // limit)
+
+
+def test_page_without_limit(run, async_session, skeptics):
+    page = run(get_all(db_session=async_session))
+    assert len(page.items) == len(skeptics)
+    assert page.next_cursor is None
+
+    cursor = skeptic_keyset.encode_cursor(page.items[3])
+    page = run(get_all(db_session=async_session, page=PageParams(cursor=cursor)))
+    assert len(page.items) == len(skeptics) - 4
+    assert page.next_cursor is None
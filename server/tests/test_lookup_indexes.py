@@ -0,0 +1,131 @@
+import datetime
+
+import pytest
+from sqlalchemy import event
+
+from sni.library import service as library_service
+from sni.mempool import service as mempool_service
+from sni.models import (
+    BlogPost,
+    BlogPostTranslation,
+    BlogSeries,
+    BlogSeriesTranslation,
+    Document,
+    DocumentTranslation,
+    FileMetadata,
+)
+
+DATE = datetime.date(2008, 10, 31)
+
+
+def markdown_fields(filename: str) -> dict:
+    return dict(
+        file_content="",
+        html_content="",
+        file_metadata=FileMetadata(filename=filename, hash="", last_modified=DATE),
+    )
+
+
+@pytest.fixture
+def content(run, async_session):
+    document = Document(slug="bitcoin", date=DATE, granularity="DAY", doctype="")
+    series = BlogSeries(slug="series", chapter_title=False)
+    post = BlogPost(slug="post", date=DATE)
+    for locale in ("en", "de"):
+        async_session.add_all(
+            [
+                DocumentTranslation(
+                    document=document,
+                    locale=locale,
+                    title=f"Bitcoin {locale}",
+                    slug="bitcoin",
+                    **markdown_fields(f"bitcoin.{locale}.md"),
+                ),
+                BlogSeriesTranslation(
+                    blog_series=series,
+                    locale=locale,
+                    title=f"Series {locale}",
+                    slug=f"series-{locale}",
+                    **markdown_fields(f"series.{locale}.md"),
+                ),
+                BlogPostTranslation(
+                    blog_post=post,
+                    locale=locale,
+                    title=f"Post {locale}",
+                    slug="post",
+                    excerpt="",
+                    **markdown_fields(f"post.{locale}.md"),
+                ),
+            ]
+        )
+    run(async_session.commit())
+
+
+@pytest.fixture
+def statements(async_engine):
+    """The SQL statements executed, with their parameters."""
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append((statement, parameters))
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+
+
+def query_plan(run, async_engine, statement, parameters) -> str:
+    async def explain():
+        async with async_engine.connect() as connection:
+            result = await connection.exec_driver_sql(
+                f"EXPLAIN QUERY PLAN {statement}", parameters
+            )
+            return "\n".join(row[-1] for row in result)
+
+    return run(explain())
+
+
+@pytest.mark.parametrize(
+    "lookup, slug, table, index",
+    [
+        (
+            library_service.get,
+            "bitcoin",
+            "document_translations",
+            "ix_document_translations_locale_slug",
+        ),
+        (
+            mempool_service.get_post,
+            "post",
+            "blog_post_translations",
+            "ix_blog_post_translations_locale_slug",
+        ),
+        (
+            mempool_service.get_series,
+            "series-de",
+            "blog_series_translations",
+            # The unique constraint on slug
+            "sqlite_autoindex_blog_series_translations",
+        ),
+    ],
+    ids=["document", "blog_post", "blog_series"],
+)
+def test_translation_lookup(
+    run, async_engine, async_session, content, statements, lookup, slug, table, index
+):
+    statements.clear()
+    translation = run(lookup(slug, db_session=async_session, locale="de"))
+    assert translation.slug == slug
+    assert translation.locale == "de"
+
+    # The first statement finds the translation, the rest load relationships
+    plan = query_plan(run, async_engine, *statements[0])
+    assert f"SEARCH {table} USING INDEX {index}" in plan
+
+
+@pytest.mark.parametrize(
+    "lookup",
+    [library_service.get, mempool_service.get_post, mempool_service.get_series],
+)
+def test_translation_lookup_missing(run, async_session, content, lookup):
+    assert run(lookup("missing", db_session=async_session, locale="de")) is None